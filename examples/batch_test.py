@@ -1,11 +1,19 @@
 # Script to convert multiple PDFs to markdown using marker-pdf
 
 import os
+import io
 import json
-import glob
+import functools
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pypdfium2
+import torch
 from marker.converters.pdf import PdfConverter
 from marker.models import create_model_dict
 from marker.output import text_from_rendered
+from marker.config.parser import ConfigParser
+from marker.util import parse_range_str
 from PIL import Image
 
 # Load environment variables
@@ -25,62 +33,252 @@ config = {
     "GoogleGeminiService_gemini_api_key": os.getenv("GEMINI_API_KEY"),
 }
 
-# Setup the converter
-from marker.config.parser import ConfigParser
-config_parser = ConfigParser(config)
-converter = PdfConverter(
-    config=config_parser.generate_config_dict(),
-    artifact_dict=create_model_dict(),
-    llm_service=config_parser.get_llm_service()
-)
-
-# Get all PDF files from the input directory
-pdf_files = glob.glob(os.path.join(input_dir, "*.pdf"))
-print(f"Found {len(pdf_files)} PDF files to process")
-
-# Process each PDF file one by one
-for pdf_file in pdf_files:
+# Number of PDFs converted concurrently per GPU when CUDA is available; on
+# CPU-only machines the pool defaults to one worker per core instead. Set
+# BATCH_MAX_WORKERS to override either default
+workers_per_gpu = 1
+
+# Skip pages without a text layer (scanned images) instead of sending them
+# through the LLM pipeline. Off by default: scanned pages may still hold
+# diagrams or text that marker's OCR would recover. Skipped pages are printed
+skip_image_only_pages = False
+
+# Write each PDF's markdown, images and metadata into one <name>.zip instead
+# of a directory (the document processor expects directories, so off by default)
+archive_outputs = False
+
+# Encoder settings per image format: favour encode speed over file size
+image_save_options = {
+    "JPEG": {"quality": 85, "optimize": False, "progressive": False},
+    "PNG": {"compress_level": 1},
+}
+
+
+# Device the marker models run on in this process (set by _init_worker)
+_device = None
+
+
+@functools.lru_cache(maxsize=1)
+def _artifacts(device=None):
+    """Load the marker models once per process."""
+    return create_model_dict(device=device)
+
+
+@functools.lru_cache(maxsize=16)
+def _converter(config_json):
+    """
+    Build a PdfConverter for a serialized config, reusing loaded models.
+
+    Per-PDF settings such as page_range are kept out of the key and set on
+    the returned converter's config instead, so every file shares one.
+    """
+    config_parser = ConfigParser(json.loads(config_json))
+    return PdfConverter(
+        config=config_parser.generate_config_dict(),
+        artifact_dict=_artifacts(_device),
+        llm_service=config_parser.get_llm_service()
+    )
+
+
+def _config_key(config):
+    """Serialize config deterministically so it can be used as a cache key."""
+    return json.dumps(config, sort_keys=True)
+
+
+def _format_page_range(indices):
+    """Collapse sorted page indices into a range string such as "0,3,5-9"."""
+    ranges = []
+    for index in indices:
+        if ranges and ranges[-1][1] == index - 1:
+            ranges[-1][1] = index
+        else:
+            ranges.append([index, index])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def _text_page_range(pdf_file):
+    """
+    Find pages that carry extractable text.
+
+    Returns a marker page_range string (e.g. "0,3,5-9"), None when every
+    page has text, or "" when the PDF is image-only.
+    """
+    pdf = pypdfium2.PdfDocument(pdf_file)
+    try:
+        text_pages = []
+        skipped_pages = []
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                has_text = bool(textpage.get_text_range().strip())
+            finally:
+                textpage.close()
+                page.close()
+            (text_pages if has_text else skipped_pages).append(index)
+    finally:
+        pdf.close()
+
+    if not skipped_pages:
+        return None
+
+    print(f"Skipping image-only pages {_format_page_range(skipped_pages)} "
+          f"of {os.path.basename(pdf_file)}")
+    return _format_page_range(text_pages)
+
+
+def _init_worker(config, worker_counter=None, gpu_count=0):
+    """Pin the worker to a GPU and warm the model and converter caches."""
+    global _device
+    if gpu_count:
+        with worker_counter.get_lock():
+            worker_id = worker_counter.value
+            worker_counter.value += 1
+        _device = f"cuda:{worker_id % gpu_count}"
+        torch.cuda.set_device(_device)
+        torch.set_float32_matmul_precision("high")
+        torch.backends.cudnn.benchmark = True
+    _converter(_config_key(config))
+
+
+def _save_image(pil_image_object, target, img_filename):
+    """Encode an image with fast settings chosen from its file extension."""
+    extension = os.path.splitext(img_filename)[1].lower()
+    image_format = Image.registered_extensions().get(extension, "PNG")
+    if image_format == "JPEG" and pil_image_object.mode not in ("RGB", "L"):
+        pil_image_object = pil_image_object.convert("RGB")
+    pil_image_object.save(target, format=image_format, **image_save_options.get(image_format, {}))
+
+
+def _drain_images(image_data_dict):
+    """Yield images while removing them, so each can be freed once it is saved."""
+    while image_data_dict:
+        yield image_data_dict.popitem()
+
+
+def _save_outputs(output_dir, name, markdown_text, image_data_dict, metadata):
+    """Write markdown, images and metadata to a directory or a single archive."""
+    if archive_outputs:
+        # One uncompressed zip per PDF: images are already JPEG/PNG encoded
+        archive_path = f"{output_dir}.zip"
+        with zipfile.ZipFile(archive_path, "w", zipfile.ZIP_STORED) as zf:
+            zf.writestr(f"{name}.md", markdown_text)
+            for img_filename, pil_image_object in _drain_images(image_data_dict):
+                if isinstance(pil_image_object, Image.Image):
+                    buffer = io.BytesIO()
+                    _save_image(pil_image_object, buffer, img_filename)
+                    zf.writestr(img_filename, buffer.getvalue())
+            zf.writestr("metadata.txt", json.dumps(metadata, indent=2))
+        return archive_path
+
+    images_dir = output_dir
+
+    # Create output directory if it doesn't exist (images share it). The base
+    # directory is created up front, so a single mkdir is enough
+    try:
+        os.mkdir(output_dir)
+    except FileExistsError:
+        pass
+
+    # Save markdown content
+    with open(os.path.join(output_dir, f"{name}.md"), "w", encoding="utf-8") as f:
+        f.write(markdown_text)
+
+    # Save images
+    for img_filename, pil_image_object in _drain_images(image_data_dict):
+        target_image_path = os.path.join(images_dir, img_filename)
+        if isinstance(pil_image_object, Image.Image):
+            _save_image(pil_image_object, target_image_path, img_filename)
+
+    # Save metadata to a text file
+    with open(os.path.join(output_dir, "metadata.txt"), "w", encoding="utf-8", buffering=1 << 20) as f:
+        json.dump(metadata, f, indent=2)
+
+    return output_dir
+
+
+def _convert_one(pdf_file, config):
+    """Convert a single PDF and write markdown, images and metadata."""
     # Get base filename without extension
     base_filename = os.path.basename(pdf_file)
     filename_without_ext = os.path.splitext(base_filename)[0]
-    
-    # Create output directory for this specific PDF
+
+    # Output location for this specific PDF
     output_dir = os.path.join(output_base_dir, filename_without_ext)
-    images_dir = output_dir
-    
-    # Create output directories if they don't exist
-    os.makedirs(output_dir, exist_ok=True)
-    os.makedirs(images_dir, exist_ok=True)
-    
-    print(f"Processing: {base_filename}")
-    
-    try:
-        # Convert the PDF
+
+    # Restrict conversion to text-bearing pages
+    page_range = None
+    if skip_image_only_pages:
+        page_range = _text_page_range(pdf_file)
+        if page_range == "":
+            # Fully scanned document: nothing to extract, skip marker entirely
+            return _save_outputs(output_dir, filename_without_ext, "", {}, {"image_only": True})
+
+    # The converter is cached per base config; the page range differs per
+    # file, so set it on the converter's config for this call only. Each
+    # worker converts one PDF at a time, so this doesn't race
+    converter = _converter(_config_key(config))
+    if page_range is None:
+        converter.config.pop("page_range", None)
+    else:
+        converter.config["page_range"] = parse_range_str(page_range)
+
+    # Convert the PDF. Pass the path rather than an in-memory buffer: pdfium
+    # reads pages lazily from the file, while marker copies BytesIO input to
+    # a temporary file first
+    with torch.inference_mode():
         rendered = converter(pdf_file)
-        
-        # Extract markdown content and images
-        markdown_text, _, image_data_dict = text_from_rendered(rendered)
-        
-        # Save markdown content
-        with open(os.path.join(output_dir, f"{filename_without_ext}.md"), "w", encoding="utf-8") as f:
-            f.write(markdown_text)
-        
-        # Save images
-        if isinstance(image_data_dict, dict) and image_data_dict:
-            for img_filename, pil_image_object in image_data_dict.items():
-                target_image_path = os.path.join(images_dir, img_filename)
-                if isinstance(pil_image_object, Image.Image):
-                    pil_image_object.save(target_image_path)
-        
-        # Save metadata to a text file
-        metadata = rendered.metadata
-        with open(os.path.join(output_dir, "metadata.txt"), "w", encoding="utf-8") as f:
-            f.write(json.dumps(metadata, indent=2))
-        
-        print(f"Conversion complete for {base_filename}. Output saved to {output_dir}")
-    
-    except Exception as e:
-        print(f"Error processing {base_filename}: {str(e)}")
-        continue
-
-print("All PDFs processed")
+
+    # Extract markdown content and images, then drop the rendered document so
+    # only the pieces still being written stay alive
+    markdown_text, _, image_data_dict = text_from_rendered(rendered)
+    if not isinstance(image_data_dict, dict):
+        image_data_dict = {}
+    metadata = rendered.metadata
+    del rendered
+
+    return _save_outputs(
+        output_dir, filename_without_ext, markdown_text, image_data_dict, metadata
+    )
+
+
+if __name__ == "__main__":
+    # Size the pool by GPUs when available: each worker holds its own copy of
+    # the models on its device, so CPU-count workers would oversubscribe them
+    gpu_count = torch.cuda.device_count()
+    default_workers = gpu_count * workers_per_gpu if gpu_count else os.cpu_count() or 1
+    max_workers = int(os.getenv("BATCH_MAX_WORKERS", default_workers))
+
+    print(f"Processing PDF files from {input_dir} with {max_workers} workers")
+    os.makedirs(output_base_dir, exist_ok=True)
+
+    # Spread workers round-robin across GPUs when available. CUDA cannot be
+    # used from forked children, so GPU workers are spawned instead
+    mp_context = multiprocessing.get_context("spawn" if gpu_count else None)
+    worker_counter = mp_context.Value("i", 0)
+
+    # Convert PDFs concurrently; each worker process loads its own converter
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(config, worker_counter, gpu_count)
+    ) as executor, os.scandir(input_dir) as entries:
+        # Stream PDF files from the input directory straight into the pool;
+        # DirEntry caches the file type so no extra stat() is needed
+        futures = {
+            executor.submit(_convert_one, entry.path, config): entry.path
+            for entry in entries
+            if entry.name.endswith(".pdf") and entry.is_file(follow_symlinks=False)
+        }
+        print(f"Found {len(futures)} PDF files to process")
+
+        for future in as_completed(futures):
+            base_filename = os.path.basename(futures[future])
+            try:
+                output_dir = future.result()
+                print(f"Conversion complete for {base_filename}. Output saved to {output_dir}")
+            except Exception as e:
+                print(f"Error processing {base_filename}: {str(e)}")
+
+    print("All PDFs processed")
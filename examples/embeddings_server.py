@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Sidecar embeddings server for the example apps
+
+Loads one EmbeddingsService (ChromaDB client, caches) and serves searches
+over HTTP so several Streamlit processes can share it instead of each
+building their own.
+
+Usage:
+    python examples/embeddings_server.py        # listens on localhost:8765
+
+Point simple_streamlit.py at it with:
+    export EMBEDDINGS_SERVER_URL=http://localhost:8765
+"""
+
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from physiology_rag.core.embeddings_service import EmbeddingsService
+
+HOST = os.getenv("EMBEDDINGS_SERVER_HOST", "localhost")
+PORT = int(os.getenv("EMBEDDINGS_SERVER_PORT", "8765"))
+
+embeddings_service = None
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    """Handle POST /search and POST /search_batch with JSON bodies."""
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            n_results = request.get("n_results")
+
+            if self.path == "/search":
+                result = embeddings_service.search_documents(request["query"], n_results)
+            elif self.path == "/search_batch":
+                result = embeddings_service.search_documents_batch(request["queries"], n_results)
+            else:
+                self.send_error(404)
+                return
+        except (KeyError, ValueError) as e:
+            self.send_error(400, str(e))
+            return
+
+        body = json.dumps(result).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    global embeddings_service
+    print("🧠 Loading embeddings service...")
+    embeddings_service = EmbeddingsService()
+
+    server = ThreadingHTTPServer((HOST, PORT), SearchHandler)
+    print(f"✅ Embeddings server listening on http://{HOST}:{PORT}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,11 +14,10 @@ load_dotenv()
 # Define input and output paths
 input_pdf = "input.pdf"
 output_dir = "./output4/"
-images_dir = output_dir 
+images_dir = output_dir  # Images are written alongside the markdown
 
-# Create output directories if they don't exist
+# Create output directory if it doesn't exist (images share it)
 os.makedirs(output_dir, exist_ok=True)
-os.makedirs(images_dir, exist_ok=True)
 
 # Set up configuration with Gemini model
 config = {
@@ -29,6 +28,12 @@ config = {
     "GoogleGeminiService_gemini_api_key": os.getenv("GEMINI_API_KEY"),
 }
 
+# Encoder settings per image format: favour encode speed over file size
+image_save_options = {
+    "JPEG": {"quality": 85, "optimize": False, "progressive": False},
+    "PNG": {"compress_level": 1},
+}
+
 # Setup the converter
 from marker.config.parser import ConfigParser
 config_parser = ConfigParser(config)
@@ -48,16 +53,23 @@ markdown_text, _, image_data_dict = text_from_rendered(rendered)
 with open(os.path.join(output_dir, "output.md"), "w", encoding="utf-8") as f:
     f.write(markdown_text)
 
-# Save images
-if isinstance(image_data_dict, dict) and image_data_dict:
-    for img_filename, pil_image_object in image_data_dict.items():
+# Save images, removing each from the dict so it can be freed once written
+if isinstance(image_data_dict, dict):
+    while image_data_dict:
+        img_filename, pil_image_object = image_data_dict.popitem()
         target_image_path = os.path.join(images_dir, img_filename)
         if isinstance(pil_image_object, Image.Image):
-            pil_image_object.save(target_image_path)
+            extension = os.path.splitext(img_filename)[1].lower()
+            image_format = Image.registered_extensions().get(extension, "PNG")
+            if image_format == "JPEG" and pil_image_object.mode not in ("RGB", "L"):
+                pil_image_object = pil_image_object.convert("RGB")
+            pil_image_object.save(
+                target_image_path, format=image_format, **image_save_options.get(image_format, {})
+            )
 
 # Save metadata to a text file
 metadata = rendered.metadata
-with open(os.path.join(output_dir, "metadata.txt"), "w", encoding="utf-8") as f:
-    f.write(json.dumps(metadata, indent=2))
+with open(os.path.join(output_dir, "metadata.txt"), "w", encoding="utf-8", buffering=1 << 20) as f:
+    json.dump(metadata, f, indent=2)
 
 print(f"Conversion complete. Output saved to {output_dir}")
@@ -5,7 +5,6 @@ Run this script to process documents and set up the vector database.
 """
 
 import os
-import json
 from physiology_rag.core.document_processor import DocumentProcessor
 from physiology_rag.core.embeddings_service import EmbeddingsService
 
@@ -13,10 +12,10 @@ def main():
     print("🧠 Setting up Physiology RAG Chatbot...")
     
     # Check for required environment variables
-    project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
-    if not project_id:
-        print("❌ Error: GOOGLE_CLOUD_PROJECT environment variable not set")
-        print("Please set it with: export GOOGLE_CLOUD_PROJECT=your-project-id")
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        print("❌ Error: GEMINI_API_KEY environment variable not set")
+        print("Please set it with: export GEMINI_API_KEY=your-api-key")
         return
     
     # Step 1: Process documents
@@ -25,17 +24,18 @@ def main():
     documents = processor.process_all_documents()
     
     # Save processed data
-    with open("processed_documents.json", "w", encoding="utf-8") as f:
-        json.dump(documents, f, indent=2, ensure_ascii=False)
+    processor.save_processed_documents(documents, "processed_documents.json")
     
     print(f"✅ Processed {len(documents)} documents")
     
     # Step 2: Set up embeddings and vector database
     print("\n🔗 Setting up embeddings and vector database...")
-    embeddings_service = EmbeddingsService(project_id=project_id)
+    embeddings_service = EmbeddingsService(api_key)
     
-    # Add documents to vector database
+    # Add documents to vector database, plus a compact copy for search when
+    # EMBEDDING_DTYPE is bf16/int8/binary (the app reads the same setting)
     embeddings_service.add_documents_to_vector_db(documents)
+    print(f"Embedding storage: {embeddings_service.dtype}")
     
     # Get stats
     stats = embeddings_service.get_collection_stats()
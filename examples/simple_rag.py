@@ -6,45 +6,75 @@ NOTE: This is a debugging/example script. For production use,
 use the main RAG system at physiology_rag.core.rag_system.RAGSystem
 """
 
+import asyncio
+import functools
 import os
 import google.generativeai as genai
 from physiology_rag.core.embeddings_service import EmbeddingsService
 from physiology_rag.config.settings import get_settings
 
+class _SearchFailed(Exception):
+    """Carries a failed search result past the cache so it isn't stored."""
+    
+    def __init__(self, results: dict):
+        super().__init__(results.get('error'))
+        self.results = results
+
 class SimpleRAG:
     def __init__(self, api_key: str):
         self.api_key = api_key
         genai.configure(api_key=api_key)
         self.embeddings_service = EmbeddingsService(api_key)
         self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+        # Cache retrieval per instance; the generation key drops stale hits
+        self._cached_search = functools.lru_cache(maxsize=512)(self._search)
     
-    def answer_question(self, query: str) -> dict:
-        print(f"🔍 Searching for: {query}")
-        
-        # Step 1: Retrieve (limit to 3 results to keep it simple)
+    def _search(self, query: str, n_results: int, generation: int) -> dict:
+        results = self.embeddings_service.search_documents(query, n_results)
+        if 'error' in results:
+            # lru_cache doesn't store exceptions, so a transient failure is retried
+            raise _SearchFailed(results)
+        return results
+    
+    def search(self, query: str, n_results: int = 3) -> dict:
+        """Search documents, reusing successful results for repeated queries."""
         try:
-            search_results = self.embeddings_service.search_documents(query, 3)
-            print(f"✅ Retrieved {len(search_results['results'])} results")
-        except Exception as e:
-            return {"error": f"Retrieval failed: {e}"}
-        
-        # Step 2: Format context (keep it short)
+            return self._cached_search(query, n_results, self.embeddings_service.generation)
+        except _SearchFailed as e:
+            return e.results
+    
+    def _build_prompt(self, query: str, results: list) -> str:
+        # Format context (keep it short)
         context = ""
-        for i, result in enumerate(search_results['results'][:2]):  # Only use top 2
+        for i, result in enumerate(results[:2]):  # Only use top 2
             context += f"Source {i+1}: {result['document'][:500]}...\n\n"
         
         print(f"✅ Context formatted ({len(context)} chars)")
         
-        # Step 3: Generate (simplified prompt)
-        try:
-            prompt = f"""Based on this context about physiology:
+        # Simplified prompt
+        return f"""Based on this context about physiology:
 
 {context}
 
 Question: {query}
 
 Answer briefly:"""
-            
+    
+    def answer_question(self, query: str) -> dict:
+        print(f"🔍 Searching for: {query}")
+        
+        # Step 1: Retrieve (limit to 3 results to keep it simple)
+        try:
+            search_results = self.search(query, 3)
+            print(f"✅ Retrieved {len(search_results['results'])} results")
+        except Exception as e:
+            return {"error": f"Retrieval failed: {e}"}
+        
+        # Step 2: Format context
+        prompt = self._build_prompt(query, search_results['results'])
+        
+        # Step 3: Generate
+        try:
             print("🧠 Calling Gemini...")
             response = self.model.generate_content(prompt)
             print("✅ Gemini responded")
@@ -57,6 +87,43 @@ Answer briefly:"""
             
         except Exception as e:
             return {"error": f"Generation failed: {e}"}
+    
+    async def answer_questions(self, queries: list[str]) -> list[dict]:
+        """Answer several questions with one retrieval batch and concurrent generation."""
+        print(f"🔍 Searching for {len(queries)} queries")
+        
+        # Step 1: Retrieve all queries in one batch
+        try:
+            batch_results = self.embeddings_service.search_documents_batch(queries, 3)
+            print(f"✅ Retrieved results for {len(batch_results)} queries")
+        except Exception as e:
+            return [{"error": f"Retrieval failed: {e}"} for _ in queries]
+        
+        # Step 2: Format contexts
+        prompts = [
+            self._build_prompt(query, search_results['results'])
+            for query, search_results in zip(queries, batch_results)
+        ]
+        
+        # Step 3: Generate all answers concurrently
+        print("🧠 Calling Gemini...")
+        responses = await asyncio.gather(
+            *[self.model.generate_content_async(prompt) for prompt in prompts],
+            return_exceptions=True
+        )
+        print("✅ Gemini responded")
+        
+        answers = []
+        for query, search_results, response in zip(queries, batch_results, responses):
+            if isinstance(response, Exception):
+                answers.append({"error": f"Generation failed: {response}"})
+            else:
+                answers.append({
+                    "query": query,
+                    "answer": response.text,
+                    "sources": search_results['results']
+                })
+        return answers
 
 if __name__ == "__main__":
     try:
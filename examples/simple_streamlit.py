@@ -7,21 +7,61 @@ use the main Streamlit app at physiology_rag/ui/streamlit_app.py
 """
 
 import os
+import json
+import urllib.error
+import urllib.request
 import streamlit as st
 import google.generativeai as genai
 from physiology_rag.core.embeddings_service import EmbeddingsService
 
 st.title("🧠 Simple RAG Test")
 
+# Shared sidecar server (examples/embeddings_server.py), if one is running
+EMBEDDINGS_SERVER_URL = os.getenv('EMBEDDINGS_SERVER_URL')
+
+class RemoteEmbeddingsService:
+    """Thin client for the sidecar embeddings server."""
+    
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+    
+    def search_documents(self, query: str, n_results: int = None):
+        """Search via the server, reporting failures like EmbeddingsService does."""
+        request = urllib.request.Request(
+            f"{self.base_url}/search",
+            data=json.dumps({'query': query, 'n_results': n_results}).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                return json.load(response)
+        except (urllib.error.URLError, TimeoutError, ValueError) as e:
+            # URLError covers HTTPError; ValueError covers malformed JSON
+            return {'results': [], 'error': str(e)}
+
 # Test embeddings service directly
 @st.cache_resource
 def get_embeddings_service():
+    if EMBEDDINGS_SERVER_URL:
+        return RemoteEmbeddingsService(EMBEDDINGS_SERVER_URL)
     api_key = os.getenv('GEMINI_API_KEY')
     if not api_key:
         st.error("GEMINI_API_KEY environment variable not set")
         return None
     return EmbeddingsService(api_key=api_key)
 
+# Cache retrieval results across reruns. Failures are raised rather than
+# returned, since st.cache_data doesn't store exceptions
+@st.cache_data(ttl=3600)
+def search_documents(query: str, n_results: int):
+    service = get_embeddings_service()
+    if service is None:
+        raise RuntimeError("Embeddings service is not available")
+    result = service.search_documents(query, n_results)
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+    return result
+
 # Test Gemini directly
 @st.cache_resource
 def get_gemini_model():
@@ -35,8 +75,7 @@ def get_gemini_model():
 if st.button("Test Embeddings Service"):
     try:
         with st.spinner("Testing embeddings..."):
-            embeddings_service = get_embeddings_service()
-            result = embeddings_service.search_documents("cerebral cortex", 2)
+            result = search_documents("cerebral cortex", 2)
             st.success("Embeddings service works!")
             st.json(result)
     except Exception as e:
@@ -59,8 +98,7 @@ if prompt := st.chat_input("Test question"):
     try:
         # Test just embeddings
         with st.spinner("Testing retrieval..."):
-            embeddings_service = get_embeddings_service()
-            search_result = embeddings_service.search_documents(prompt, 3)
+            search_result = search_documents(prompt, 3)
             st.write("✅ Retrieval works")
             
         # Test just generation
@@ -1,8 +1,14 @@
 """PydanticAI agents for coordinated medical education."""
 
-from .coordinator import CoordinatorAgent, create_coordinator_agent
-
 __all__ = [
     "CoordinatorAgent",
     "create_coordinator_agent",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # Import the coordinator (and PydanticAI with it) only when first used
+    if name in __all__:
+        from . import coordinator
+        return getattr(coordinator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -4,149 +4,337 @@ Provides a simple command-line interface to interact with MedMind agents.
 """
 
 import asyncio
+import concurrent.futures
+import functools
+import inspect
+import json
 import os
 import re
+import sys
+import threading
+import traceback
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:
+    PromptSession = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
-from physiology_rag.agents.coordinator import create_coordinator_agent
-from physiology_rag.core.rag_system import RAGSystem
-from physiology_rag.core.paragraph_extractor import ParagraphExtractor
-from physiology_rag.core.answer_attribution import AnswerAttributionMapper
 from physiology_rag.config.settings import get_settings
 from physiology_rag.utils.logging import get_logger
 
+# The RAG and agent modules pull in ChromaDB and the Gemini SDK, so they are
+# imported inside the commands that use them; `info` starts without them
+if TYPE_CHECKING:
+    from physiology_rag.core.answer_attribution import AnswerAttributionMapper
+    from physiology_rag.core.rag_system import RAGSystem
+
 logger = get_logger("agent_cli")
 
+# Markdown header, bold, numbered and bullet titles in a single pattern. Each
+# branch starts with a different character, so at most one matches a line
+_RE_TITLE = re.compile(
+    r'^(?:#{2,4}\s+(?P<md>.+)'
+    r'|\*\*(?P<bold>.+?)\*\*'
+    r'|\d+\.\s+(?P<num>.+)'
+    r'|[●•-]\s*(?P<bullet>.+))'
+)
+
+# Characters a prefixed title can start with (besides digits); other lines
+# skip the regex entirely
+_TITLE_START_CHARS = frozenset('#*●•-')
+
+# Capitalised lines that are captions rather than section titles
+_NON_TITLE_PREFIXES = ('Source', 'Figure')
+
+
+# Stored section titles that carry no information; the chunk text is used instead
+_EMPTY_TITLES = frozenset({'Content', ''})
+
+# Separator lines for headings and listings
+_SEP60 = "=" * 60
+_SEP55 = "=" * 55
+_SEP50 = "=" * 50
+_SEP40 = "=" * 40
+_SEP35 = "=" * 35
+_SEP30 = "=" * 30
+_DASH60 = "-" * 60
+_DASH50 = "-" * 50
+_DASH30 = "-" * 30
+
+# Chunk text shown per source in listings; longer chunks are truncated
+MAX_SOURCE_CHARS = 2000
+
+# Titles come from the first few lines, so only this much text is inspected
+_TITLE_SCAN_CHARS = 2048
+
 
 def extract_section_title_from_text(text: str) -> str:
     """Extract a meaningful section title from chunk text."""
+    return _extract_title_cached(text[:_TITLE_SCAN_CHARS] if text else "")
+
+
+@functools.lru_cache(maxsize=2048)
+def _extract_title_cached(text: str) -> str:
+    """Extract a section title from the start of a chunk (memoized)."""
     if not text:
         return "Content"
     
-    lines = text.strip().split('\n')
+    # Only the first 10 lines are inspected, so don't split the rest
+    lines = text.lstrip().split('\n', 10)[:10]
     
     # Try different patterns in order of preference
-    for line in lines[:10]:  # Check first 10 lines
+    body_lines = 0
+    for line in lines:  # Check first 10 lines
         line = line.strip()
         if not line:
             continue
             
-        # Pattern 1: Markdown headers (##, ###, ####)
-        if re.match(r'^#{2,4}\s+(.+)', line):
-            title = re.sub(r'^#{2,4}\s+', '', line).strip()
-            if len(title) > 3:
-                return title
-        
-        # Pattern 2: Bold headers (**text**)
-        bold_match = re.match(r'^\*\*(.+?)\*\*', line)
-        if bold_match:
-            title = bold_match.group(1).strip()
-            if len(title) > 3 and not title.isdigit():
+        # Patterns 1-4: Markdown headers (##, ###, ####), bold headers (**text**),
+        # numbered sections (1., 2., etc.) and bullet points with caps (● Text, - Text)
+        first_char = line[0]
+        title_match = None
+        if first_char in _TITLE_START_CHARS or first_char.isdecimal():
+            title_match = _RE_TITLE.match(line)
+        if title_match:
+            kind = title_match.lastgroup
+            title = title_match.group(kind)
+            if kind == 'bold':
+                # The other groups start after greedy whitespace and run to the
+                # end of an already stripped line, so only bold text has spaces
+                title = title.strip()
+            if len(title) > 3 and not (
+                (kind == 'bold' and title.isdigit()) or
+                (kind == 'bullet' and not title[0].isupper())
+            ):
                 return title
         
-        # Pattern 3: Numbered sections (1., 2., etc.)
-        numbered_match = re.match(r'^\d+\.\s+(.+)', line)
-        if numbered_match:
-            title = numbered_match.group(1).strip()
-            if len(title) > 3:
-                return title
-        
-        # Pattern 4: Bullet points with caps (● Text, - Text)
-        bullet_match = re.match(r'^[●•-]\s*(.+)', line)
-        if bullet_match:
-            title = bullet_match.group(1).strip()
-            if len(title) > 3 and title[0].isupper():
-                return title
+        # Cheap length checks first; most body text lines are too long
+        line_length = len(line)
         
-        # Pattern 5: All caps headers
-        if line.isupper() and len(line) > 3 and len(line) < 80:
+        # Pattern 5: All caps headers (a lowercase first letter rules this
+        # out without walking the whole line)
+        if 3 < line_length < 80 and not first_char.islower() and line.isupper():
             return line
         
         # Pattern 6: Title case headers (first significant line)
-        if (len(line) > 5 and len(line) < 100 and 
+        if (5 < line_length < 100 and 
             line[0].isupper() and 
             not line.endswith('.') and 
-            not line.startswith('Source') and
-            not line.startswith('Figure')):
+            not line.startswith(_NON_TITLE_PREFIXES)):
             return line
+        
+        # Two long sentences in a row mean we're into body text; stop looking
+        if line_length > 120 and line.endswith('.'):
+            body_lines += 1
+            if body_lines >= 2:
+                break
+        else:
+            body_lines = 0
     
     # Fallback: use first meaningful line
     for line in lines[:5]:
         line = line.strip()
-        if len(line) > 10 and not line.startswith('|') and not line.startswith('![]'):
+        if len(line) > 10 and not line.startswith(('|', '![]')):
             return line[:50] + "..." if len(line) > 50 else line
     
     return "Content"
 
 
-def display_sources_cli(sources):
-    """Display source information in CLI format like Streamlit."""
+PROCESSED_DOCUMENTS_FILE = Path("data/processed/processed_documents.json")
+
+
+def _read_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Write a JSON file atomically, using orjson when available."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(data))
+    else:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _iter_json_items(path: Path):
+    """Iterate over the items of a top-level JSON array, streaming with ijson when available."""
+    if ijson is None:
+        yield from _read_json(path)
+        return
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_document_images(path: str, mtime_ns: int, size: int) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Index the first images of each processed document.
+    
+    Memoized per file version (path, mtime and size). The index is also kept
+    in a small sidecar file next to the documents so later runs can skip
+    parsing the full corpus while it is unchanged.
+    """
+    index_path = Path(path).with_suffix(".images_index.json")
+    try:
+        index = _read_json(index_path)
+        if index['src_mtime_ns'] == mtime_ns and index['src_size'] == size:
+            return index['images']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # Missing, stale or unreadable sidecar: rebuild it
+    
+    images_by_doc = {}
+    # With ijson the documents are streamed rather than all held in memory
+    for doc in _iter_json_items(Path(path)):
+        name = doc.get('document_name')
+        if name is not None:
+            # First 3 like Streamlit; keep the first document if names repeat
+            images_by_doc.setdefault(name, doc.get('images', [])[:3])
+    
+    try:
+        _write_json(index_path, {'src_mtime_ns': mtime_ns, 'src_size': size, 'images': images_by_doc})
+    except OSError as e:
+        logger.debug("Could not write image index %s: %s", index_path, e)
+    
+    return images_by_doc
+
+
+def get_document_images() -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """
+    Get the first images of each processed document.
+    
+    Returns:
+        Mapping of document name to image info, or None if documents
+        have not been processed yet
+    """
+    try:
+        stat = PROCESSED_DOCUMENTS_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return _load_document_images(str(PROCESSED_DOCUMENTS_FILE), stat.st_mtime_ns, stat.st_size)
+
+
+def display_sources_cli(sources, max_chars: Optional[int] = MAX_SOURCE_CHARS):
+    """
+    Display source information in CLI format like Streamlit.
+    
+    Args:
+        sources: Retrieved sources with document text and metadata
+        max_chars: Maximum characters of chunk text to show per source
+            (None shows the full chunk)
+    """
     if not sources:
         print("No sources found.")
         return
         
-    print("\n📚 Sources:")
-    print("=" * 60)
+    # Collect the listing and write it in one go instead of a print per line
+    out = []
+    append = out.append
+    
+    append("\n📚 Sources:")
+    append(_SEP60)
+    
+    # Load image info for all sources at once (cached until the file changes)
+    images_by_doc, images_error = None, None
+    try:
+        images_by_doc = get_document_images()
+    except Exception as e:
+        images_error = e
     
     for i, source in enumerate(sources):
+        # Look up each field once
+        metadata = source.get('metadata') or {}
+        metadata_get = metadata.get
         score = source.get('similarity_score', 0.0)
-        doc_name = source.get('metadata', {}).get('document_name', 'Unknown Document')
-        metadata = source.get('metadata', {})
+        doc_name = metadata_get('document_name', 'Unknown Document')
+        document = source.get('document', 'No content available')
         
         # Extract meaningful section title
-        section_title = metadata.get('title', 'Content')
-        if section_title == 'Content' or not section_title:
-            chunk_text = source.get('document', '')
-            section_title = extract_section_title_from_text(chunk_text)
-        
-        print(f"\nSource {i+1}: {doc_name} (Score: {score:.3f})")
-        print(f"Section: {section_title}")
-        print(f"Chunk: {metadata.get('chunk_index', '?')}/{metadata.get('total_chunks', '?')}")
-        print(f"Chunk Type: {metadata.get('chunk_type', 'content')}")
-        print(f"\nFull Content:")
-        print("=" * 40)
-        print(source.get('document', 'No content available'))
+        section_title = metadata_get('title', 'Content')
+        if not section_title or section_title in _EMPTY_TITLES:
+            section_title = extract_section_title_from_text(source.get('document', ''))
+        
+        document = str(document)
+        truncated = max_chars is not None and len(document) > max_chars
+        
+        # Build the header block as one string rather than six list entries
+        append(
+            f"\nSource {i+1}: {doc_name} (Score: {score:.3f})\n"
+            f"Section: {section_title}\n"
+            f"Chunk: {metadata_get('chunk_index', '?')}/{metadata_get('total_chunks', '?')}\n"
+            f"Chunk Type: {metadata_get('chunk_type', 'content')}\n"
+            f"\n{'Content' if truncated else 'Full Content'}:\n"
+            f"{_SEP40}"
+        )
+        if truncated:
+            append(document[:max_chars])
+            append(f"...(truncated {len(document) - max_chars} chars)")
+        else:
+            append(document)
         
         # Show images for this source like Streamlit does
-        print(f"\nImages from {doc_name}:")
-        print("=" * 30)
-        try:
-            # Try to get images (simplified version for CLI)
-            from pathlib import Path
-            import json
-            
-            # Load processed documents to get image info
-            processed_file = Path("data/processed/processed_documents.json")
-            if processed_file.exists():
-                with open(processed_file, "r") as f:
-                    docs = json.load(f)
-                
-                # Find images for this document
-                doc_images = []
-                for doc in docs:
-                    if doc.get('document_name') == doc_name:
-                        doc_images = doc.get('images', [])[:3]  # First 3 like Streamlit
-                        break
-                
-                if doc_images:
-                    for img in doc_images:
-                        print(f"  - {img.get('type', 'Unknown')} {img.get('number', '?')}: {img.get('filename', 'No filename')}")
-                        print(f"    Path: {img.get('path', 'No path')}")
-                else:
-                    print("  No images found for this document")
+        append(f"\nImages from {doc_name}:")
+        append(_SEP30)
+        if images_error is not None:
+            append(f"  Error loading images: {images_error}")
+        elif images_by_doc is None:
+            append("  Cannot load image information")
+        else:
+            doc_images = images_by_doc.get(doc_name, [])
+            if doc_images:
+                for img in doc_images:
+                    append(f"  - {img.get('type', 'Unknown')} {img.get('number', '?')}: {img.get('filename', 'No filename')}")
+                    append(f"    Path: {img.get('path', 'No path')}")
             else:
-                print("  Cannot load image information")
-                
-        except Exception as e:
-            print(f"  Error loading images: {e}")
+                append("  No images found for this document")
         
-        print("-" * 60)
+        append(_DASH60)
+    
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+@functools.lru_cache(maxsize=1)
+def get_rag_system() -> "RAGSystem":
+    """Get the process-wide RAG system, creating it on first use."""
+    from physiology_rag.core.rag_system import RAGSystem
+    
+    return RAGSystem(get_settings().gemini_api_key)
+
+
+@functools.lru_cache(maxsize=1)
+def get_attribution_mapper() -> "AnswerAttributionMapper":
+    """Get the process-wide answer attribution mapper, creating it on first use."""
+    from physiology_rag.core.answer_attribution import AnswerAttributionMapper
+    
+    return AnswerAttributionMapper(get_settings().gemini_api_key)
 
 
 async def test_rag_with_sources():
     """Test RAG system directly to see source attribution like Streamlit."""
     print("🧪 Testing RAG System with Enhanced Source Display")
-    print("=" * 55)
+    print(_SEP55)
     
     try:
         # Initialize system
@@ -156,7 +344,7 @@ async def test_rag_with_sources():
             print("❌ Error: GEMINI_API_KEY not found.")
             return
         
-        rag_system = RAGSystem(settings.gemini_api_key)
+        rag_system = get_rag_system()
         print("✅ RAG system initialized")
         
         # Test with blood-brain barrier question
@@ -168,7 +356,7 @@ async def test_rag_with_sources():
         
         # Display answer
         print("\n🧠 Answer:")
-        print("=" * 40)
+        print(_SEP40)
         print(result.get('answer', 'No answer generated'))
         
         # Display sources with enhanced titles
@@ -179,13 +367,15 @@ async def test_rag_with_sources():
         
     except Exception as e:
         print(f"❌ Test failed: {e}")
-        logger.error(f"Testing error: {e}")
+        logger.error("Testing error: %s", e)
 
 
 async def test_paragraph_extraction():
     """Test paragraph extraction on RAG sources."""
+    from physiology_rag.core.paragraph_extractor import ParagraphExtractor
+    
     print("🧪 Testing Paragraph Extraction")
-    print("=" * 40)
+    print(_SEP40)
     
     try:
         # Initialize system
@@ -195,16 +385,21 @@ async def test_paragraph_extraction():
             print("❌ Error: GEMINI_API_KEY not found.")
             return
         
-        rag_system = RAGSystem(settings.gemini_api_key)
-        paragraph_extractor = ParagraphExtractor()
-        print("✅ Systems initialized")
+        rag_system = get_rag_system()
         
         # Test with blood-brain barrier question
         test_question = "How does the blood-brain barrier protect neurons while allowing glucose transport?"
+        
+        # Start retrieving RAG sources (no answer generation) in the background
+        # and set up the paragraph extractor while the search runs
+        retrieval = asyncio.create_task(
+            asyncio.to_thread(rag_system.retrieve_relevant_chunks, test_question, 3)
+        )
+        paragraph_extractor = ParagraphExtractor()
+        print("✅ Systems initialized")
         print(f"\n🧪 Testing question: {test_question}")
         
-        # Get RAG sources only (no answer generation)
-        sources = rag_system.retrieve_relevant_chunks(test_question, 3)
+        sources = await retrieval
         source_list = sources.get('results', [])
         
         if not source_list:
@@ -217,7 +412,7 @@ async def test_paragraph_extraction():
         paragraphs = paragraph_extractor.extract_paragraphs_from_sources(source_list)
         
         print(f"\n📄 Extracted {len(paragraphs)} paragraphs")
-        print("=" * 50)
+        print(_SEP50)
         
         # Display paragraphs
         for i, paragraph in enumerate(paragraphs):
@@ -227,23 +422,25 @@ async def test_paragraph_extraction():
             print(f"Paragraph Index: {paragraph.paragraph_index}")
             print(f"Content Length: {len(paragraph.content)} chars")
             print(f"\nContent Preview:")
-            print("-" * 30)
+            print(_DASH30)
             # Show first 200 chars
             preview = paragraph.content[:200] + "..." if len(paragraph.content) > 200 else paragraph.content
             print(preview)
-            print("-" * 50)
+            print(_DASH50)
         
         print("\n🎉 Paragraph extraction testing completed!")
         
     except Exception as e:
         print(f"❌ Test failed: {e}")
-        logger.error(f"Paragraph extraction error: {e}")
+        logger.error("Paragraph extraction error: %s", e)
 
 
 async def test_answer_attribution():
     """Test answer attribution mapping with paragraph extraction."""
+    from physiology_rag.core.paragraph_extractor import ParagraphExtractor
+    
     print("🧪 Testing Answer Attribution with Precise Citations")
-    print("=" * 55)
+    print(_SEP55)
     
     try:
         # Initialize systems
@@ -253,9 +450,9 @@ async def test_answer_attribution():
             print("❌ Error: GEMINI_API_KEY not found.")
             return
         
-        rag_system = RAGSystem(settings.gemini_api_key)
+        rag_system = get_rag_system()
         paragraph_extractor = ParagraphExtractor()
-        attribution_mapper = AnswerAttributionMapper(settings.gemini_api_key)
+        attribution_mapper = get_attribution_mapper()
         print("✅ All systems initialized")
         
         # Test with blood-brain barrier question
@@ -287,12 +484,12 @@ async def test_answer_attribution():
         )
         
         # Step 4: Display results
-        print("\n" + "=" * 60)
+        print("\n" + _SEP60)
         print("📋 ATTRIBUTED ANSWER RESULTS")
-        print("=" * 60)
+        print(_SEP60)
         
         print(f"\n🧠 Original Answer:")
-        print("-" * 30)
+        print(_DASH30)
         print(answer[:300] + "..." if len(answer) > 300 else answer)
         
         print(f"\n🎯 Attribution Analysis:")
@@ -301,7 +498,7 @@ async def test_answer_attribution():
         print(f"  • Overall confidence: {attributed_answer.overall_confidence:.2f}")
         
         print(f"\n📊 Detailed Attributions:")
-        print("-" * 50)
+        print(_DASH50)
         
         for i, attribution in enumerate(attributed_answer.attributions):
             print(f"\n🔹 Segment {i+1} ({attribution.attribution_type}, confidence: {attribution.confidence:.2f}):")
@@ -320,15 +517,44 @@ async def test_answer_attribution():
         
     except Exception as e:
         print(f"❌ Test failed: {e}")
-        logger.error(f"Answer attribution error: {e}")
-        import traceback
+        logger.error("Answer attribution error: %s", e)
         print(f"Traceback: {traceback.format_exc()}")
 
 
+async def read_user_input(prompt: str, session=None) -> str:
+    """Read a line of user input without blocking the event loop."""
+    if session is not None:
+        return await session.prompt_async(prompt)
+    
+    if not sys.stdin.isatty():
+        # Piped input (tests, automation): read whole lines without a prompt
+        line = await asyncio.to_thread(sys.stdin.readline)
+        if not line:
+            raise EOFError
+        return line
+    
+    # Read stdin on a daemon thread: unlike the default executor, it never
+    # holds up interpreter shutdown when Ctrl+C arrives mid-read
+    result = concurrent.futures.Future()
+    
+    def read_line():
+        try:
+            result.set_result(input(prompt))
+        except concurrent.futures.InvalidStateError:
+            pass  # Session was cancelled while waiting for input
+        except BaseException as e:
+            result.set_exception(e)
+    
+    threading.Thread(target=read_line, daemon=True).start()
+    return await asyncio.wrap_future(result)
+
+
 async def interactive_session():
     """Run an interactive session with the Coordinator Agent."""
+    from physiology_rag.agents.coordinator import create_coordinator_agent
+    
     print("🧠 MedMind Coordinator Agent - Interactive Mode")
-    print("=" * 50)
+    print(_SEP50)
     
     try:
         # Initialize system
@@ -341,7 +567,7 @@ async def interactive_session():
             return
         
         # Create RAG system
-        rag_system = RAGSystem(settings.gemini_api_key)
+        rag_system = get_rag_system()
         
         # Create coordinator agent
         coordinator, context = create_coordinator_agent(
@@ -357,10 +583,14 @@ async def interactive_session():
         print("  - 'How am I doing with my learning progress?'")
         print("\nType 'exit' to quit.\n")
         
+        # Use prompt_toolkit on a terminal when available (history, line
+        # editing); otherwise read stdin off the event loop thread
+        session = PromptSession() if PromptSession is not None and sys.stdin.isatty() else None
+        
         # Interactive loop
         while True:
             try:
-                user_input = input("🎓 You: ").strip()
+                user_input = (await read_user_input("🎓 You: ", session)).strip()
                 
                 if user_input.lower() in ['exit', 'quit', 'bye']:
                     print("👋 Goodbye! Happy learning!")
@@ -371,27 +601,30 @@ async def interactive_session():
                 
                 print("🤖 MedMind is thinking...")
                 
-                # Process user input
-                response = await coordinator.handle_conversation(user_input, context)
-                
-                print(f"🧠 MedMind: {response}\n")
+                # Process user input, printing the answer as it is generated
+                print("🧠 MedMind: ", end="", flush=True)
+                async for chunk in coordinator.handle_conversation_stream(user_input, context):
+                    print(chunk, end="", flush=True)
+                print("\n")
                 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n👋 Goodbye! Happy learning!")
                 break
             except Exception as e:
                 print(f"❌ Error: {e}")
-                logger.error(f"Error in interactive session: {e}")
+                logger.error("Error in interactive session: %s", e)
     
     except Exception as e:
         print(f"❌ Failed to initialize MedMind: {e}")
-        logger.error(f"Initialization error: {e}")
+        logger.error("Initialization error: %s", e)
 
 
 async def test_coordinator():
     """Run basic tests of the coordinator agent."""
+    from physiology_rag.agents.coordinator import create_coordinator_agent
+    
     print("🧪 Testing MedMind Coordinator Agent")
-    print("=" * 40)
+    print(_SEP40)
     
     try:
         # Initialize system
@@ -401,7 +634,7 @@ async def test_coordinator():
             print("❌ Error: GEMINI_API_KEY not found.")
             return
         
-        rag_system = RAGSystem(settings.gemini_api_key)
+        rag_system = get_rag_system()
         coordinator, context = create_coordinator_agent(rag_system, "test_user")
         
         print("✅ Coordinator agent initialized")
@@ -414,25 +647,31 @@ async def test_coordinator():
             "What is the action potential?"
         ]
         
-        for i, test_input in enumerate(test_cases, 1):
+        # Run the independent test cases concurrently; handle_conversation
+        # only reads the shared context
+        responses = await asyncio.gather(
+            *(coordinator.handle_conversation(test_input, context) for test_input in test_cases),
+            return_exceptions=True
+        )
+        
+        for i, (test_input, response) in enumerate(zip(test_cases, responses), 1):
             print(f"\n🧪 Test {i}: {test_input}")
-            try:
-                response = await coordinator.handle_conversation(test_input, context)
+            if isinstance(response, Exception):
+                print(f"❌ Error: {response}")
+            else:
                 print(f"✅ Response: {response[:100]}...")
-            except Exception as e:
-                print(f"❌ Error: {e}")
         
         print("\n🎉 Testing completed!")
         
     except Exception as e:
         print(f"❌ Test failed: {e}")
-        logger.error(f"Testing error: {e}")
+        logger.error("Testing error: %s", e)
 
 
 def show_system_info():
     """Show system information and status."""
     print("🔍 MedMind System Information")
-    print("=" * 35)
+    print(_SEP35)
     
     try:
         settings = get_settings()
@@ -444,58 +683,66 @@ def show_system_info():
         print(f"🔍 Max retrieval results: {settings.max_retrieval_results}")
         
         # Check for vector database
-        chroma_path = Path("./chroma_db")
-        print(f"📚 Vector database: {'Found' if chroma_path.exists() else 'Not found'}")
-        
-        # Check for processed documents
-        output_path = Path("./output")
-        if output_path.exists():
-            doc_count = len([d for d in output_path.iterdir() if d.is_dir()])
-            print(f"📄 Processed documents: {doc_count}")
-        else:
-            print("📄 Processed documents: 0")
+        print(f"📚 Vector database: {'Found' if os.path.exists('./chroma_db') else 'Not found'}")
+        
+        # Check for processed documents (DirEntry caches the file type, so
+        # counting directories needs no extra stat calls)
+        try:
+            with os.scandir("./output") as entries:
+                doc_count = sum(1 for entry in entries if entry.is_dir())
+        except FileNotFoundError:
+            doc_count = 0
+        print(f"📄 Processed documents: {doc_count}")
         
     except Exception as e:
         print(f"❌ Error getting system info: {e}")
 
 
+# CLI subcommands: name -> (handler, usage description)
+_COMMANDS = {
+    "test": (test_coordinator, "Run tests"),
+    "test-sources": (test_rag_with_sources, "Test RAG with enhanced sources"),
+    "test-paragraphs": (test_paragraph_extraction, "Test paragraph extraction"),
+    "test-attribution": (test_answer_attribution, "Test answer attribution mapping"),
+    "info": (show_system_info, "System info"),
+    "interactive": (interactive_session, "Interactive mode"),
+}
+
+
+def show_usage():
+    """Print the available CLI commands."""
+    print("🔧 MedMind Coordinator Agent CLI")
+    print("\nAvailable commands:")
+    print(f"  {'medmind-cli':<32} # Interactive mode")
+    for name, (_, description) in _COMMANDS.items():
+        print(f"  {'medmind-cli ' + name:<32} # {description}")
+
+
 async def main_async():
     """Async main CLI entry point."""
-    import sys
-    
     if len(sys.argv) < 2:
         await interactive_session()
         return
     
-    command = sys.argv[1].lower()
-    
-    if command == "test":
-        await test_coordinator()
-    elif command == "test-sources":
-        await test_rag_with_sources()
-    elif command == "test-paragraphs":
-        await test_paragraph_extraction()
-    elif command == "test-attribution":
-        await test_answer_attribution()
-    elif command == "info":
-        show_system_info()
-    elif command == "interactive":
-        await interactive_session()
+    command = _COMMANDS.get(sys.argv[1].lower())
+    if command is None:
+        show_usage()
+        return
+    
+    handler = command[0]
+    if inspect.iscoroutinefunction(handler):
+        await handler()
     else:
-        print("🔧 MedMind Coordinator Agent CLI")
-        print("\nAvailable commands:")
-        print("  medmind-cli                      # Interactive mode")
-        print("  medmind-cli test                # Run tests")
-        print("  medmind-cli test-sources        # Test RAG with enhanced sources")
-        print("  medmind-cli test-paragraphs     # Test paragraph extraction")
-        print("  medmind-cli test-attribution    # Test answer attribution mapping")
-        print("  medmind-cli info                # System info")
-        print("  medmind-cli interactive         # Interactive mode")
+        handler()
 
 
 def main():
     """Sync main entry point for package scripts."""
-    asyncio.run(main_async())
+    # uvloop's event loop is faster for the awaited LLM calls where installed
+    if uvloop is not None:
+        uvloop.run(main_async())
+    else:
+        asyncio.run(main_async())
 
 
 if __name__ == "__main__":
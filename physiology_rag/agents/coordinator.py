@@ -3,27 +3,154 @@ Coordinator Agent - Main orchestrator for MedMind's multi-agent learning system.
 Routes educational requests to specialized agents and coordinates responses.
 """
 
+import asyncio
+import functools
 import re
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, ClassVar, Dict, Iterator, List, Optional, Tuple
 
 from pydantic_ai import Agent, RunContext
-from pydantic import BaseModel
 
 from physiology_rag.dependencies.medical_context import MedicalContext, create_medical_context
-from physiology_rag.models.learning_models import (
-    LearningResponse, 
-    LearningIntent, 
-    UserQuery,
-    QuizResponse,
-    TutorResponse,
-    ProgressUpdate,
-)
+from physiology_rag.models.learning_models import LearningResponse, LearningIntent
+from physiology_rag.core.cache_manager import QueryCache, SemanticQueryCache
 from physiology_rag.core.rag_system import RAGSystem
 from physiology_rag.utils.logging import get_logger
 
 logger = get_logger("coordinator_agent")
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Medical topics recognised in queries, in order of preference
+_MEDICAL_TERMS = (
+    "neurophysiology", "cardiovascular", "respiratory", "endocrine",
+    "musculoskeletal", "digestive", "renal", "immune", "reproduction",
+    "metabolism", "homeostasis", "synapse", "neuron", "hormone",
+    "blood", "heart", "lung", "kidney", "muscle", "bone"
+)
+
+# All terms in one pattern so a query is scanned once. Terms must start a
+# word (plurals still match) so e.g. "backbone" doesn't count as "bone"
+_TOPIC_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(_MEDICAL_TERMS, key=len, reverse=True))) + ")"
+)
+
+# Intent keywords, checked in this order; like topics they must start a word
+_QUIZ_RE = re.compile(r"\b(?:quiz|test|question|practice|assessment)")
+_EXPLAIN_RE = re.compile(r"\b(?:explain|what is|how does|why|definition|describe)")
+_PROGRESS_RE = re.compile(r"\b(?:progress|how am i doing|stats|performance|mastery)")
+
+# Aspects of a topic searched separately when building a quiz
+_QUIZ_FACETS = (
+    "definition", "mechanism", "regulation", "clinical relevance", "key structures"
+)
+
+_NO_ANSWER_MESSAGE = (
+    "I couldn't find specific information about that topic in the medical documents. "
+    "Could you try asking about neurophysiology, motor control, or other physiology topics?"
+)
+
+# Recommendations returned by check_learning_progress
+MAX_RECOMMENDATIONS = 3
+
+# Results retrieved speculatively per turn (search_medical_content's default)
+PREFETCH_RESULTS = 3
+
+# Retrievals started by the current process_user_input call, keyed by
+# (normalized query, n_results). Kept per call rather than on the shared
+# MedicalContext so concurrent calls can't take or drop each other's
+_prefetched_retrievals: ContextVar[Optional[Dict[Tuple[str, int], asyncio.Task]]] = ContextVar(
+    "_prefetched_retrievals", default=None
+)
+
+# Users often repeat phrasings, so the pure text helpers below are memoized
+
+@functools.lru_cache(maxsize=1024)
+def _extract_topics_from_lower(query_lower: str) -> Tuple[str, ...]:
+    """Extract medical topics, in preference order, from lowercased text."""
+    # Simple topic extraction - can be enhanced with NLP
+    found = set(_TOPIC_RE.findall(query_lower))
+    if not found:
+        return ()
+    
+    return tuple(term for term in _MEDICAL_TERMS if term in found)
+
+
+def _extract_primary_topic_from_lower(text_lower: str) -> Optional[str]:
+    """Extract the preferred medical topic from lowercased text."""
+    topics = _extract_topics_from_lower(text_lower)
+    return topics[0] if topics else None
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_intent(input_lower: str) -> str:
+    """Classify lowercased input as 'quiz', 'explanation', 'progress' or 'general'."""
+    if _QUIZ_RE.search(input_lower):
+        return "quiz"
+    if _EXPLAIN_RE.search(input_lower):
+        return "explanation"
+    if _PROGRESS_RE.search(input_lower):
+        return "progress"
+    return "general"
+
+
+def _ignore_result(task: asyncio.Task) -> None:
+    """Mark a finished task's error as handled when nobody awaits it."""
+    if not task.cancelled():
+        task.exception()
+
+
+async def _iterate_in_thread(iterator: Iterator[str]) -> AsyncIterator[str]:
+    """Consume a blocking iterator, advancing it in a worker thread."""
+    done = object()
+    try:
+        while True:
+            item = await asyncio.to_thread(next, iterator, done)
+            if item is done:
+                return
+            yield item
+    finally:
+        # Release the underlying stream when the consumer stops early
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            try:
+                await asyncio.to_thread(close)
+            except ValueError:
+                # Cancelled mid-read: the worker thread still owns the
+                # generator, which finishes that read and is then collected
+                logger.debug("Stream still being read; not closing it")
+
+
+def _normalize_query(message: str) -> str:
+    """Normalize a question for cache lookups (case and whitespace)."""
+    return _WHITESPACE_RE.sub(" ", message.strip().lower())
+
+
+def _build_recommendations(context: MedicalContext) -> List[str]:
+    """Generate learning recommendations based on context."""
+    recommendations = []
+    
+    # Knowledge gaps recommendations
+    if context.learning_profile.knowledge_gaps:
+        recommendations.append(
+            f"Review {len(context.learning_profile.knowledge_gaps)} topics that need attention"
+        )
+    
+    # Difficulty progression (stop scanning once the list is full)
+    for topic, score in context.learning_profile.mastery_scores.items():
+        if len(recommendations) >= MAX_RECOMMENDATIONS:
+            break
+        if score > 0.8:
+            recommendations.append(f"Ready for advanced {topic} concepts")
+        elif score < 0.4:
+            recommendations.append(f"Practice basic {topic} fundamentals")
+    
+    # Session continuity
+    if context.current_topics and len(recommendations) < MAX_RECOMMENDATIONS:
+        recommendations.append(f"Continue exploring {', '.join(context.current_topics)}")
+    
+    return recommendations
+
 
 class CoordinatorAgent:
     """
@@ -31,6 +158,9 @@ class CoordinatorAgent:
     Provides the primary interface for student interactions with MedMind.
     """
     
+    # PydanticAI agents shared by all coordinators, keyed by model name
+    _agent_cache: ClassVar[Dict[str, Agent]] = {}
+    
     def __init__(self, model_name: str = "gemini-2.0-flash-exp"):
         """
         Initialize the Coordinator Agent.
@@ -40,20 +170,34 @@ class CoordinatorAgent:
         """
         self.model_name = model_name
         
-        # Create the PydanticAI agent for coordination
-        self.agent = Agent(
+        # Share one PydanticAI agent per model: its tools only use ctx.deps, so
+        # sessions differ only in the context passed to run()
+        self.agent = self._agent_cache.get(model_name)
+        if self.agent is None:
+            self.agent = self._agent_cache[model_name] = self._build_agent(model_name)
+        
+        # Recent answers per user, matched exactly and by query embedding
+        self.response_cache = QueryCache(max_entries=512, ttl_seconds=3600)
+        self.semantic_cache = SemanticQueryCache(max_entries=512, ttl_seconds=3600)
+        
+        logger.info("Initialized CoordinatorAgent with model: %s", model_name)
+    
+    @classmethod
+    def _build_agent(cls, model_name: str) -> Agent:
+        """Create the PydanticAI agent for coordination and register its tools."""
+        agent = Agent(
             model_name,
             deps_type=MedicalContext,
             output_type=LearningResponse,
-            system_prompt=self._get_system_prompt()
+            system_prompt=cls._get_system_prompt()
         )
         
         # Register tools for agent coordination
-        self._register_tools()
-        
-        logger.info(f"Initialized CoordinatorAgent with model: {model_name}")
+        cls._register_tools(agent)
+        return agent
     
-    def _get_system_prompt(self) -> str:
+    @staticmethod
+    def _get_system_prompt() -> str:
         """Define the coordinator agent's system prompt."""
         return """
 You are the Coordinator Agent for MedMind, an AI-powered medical education platform.
@@ -75,26 +219,34 @@ When a student asks a question, you should:
 Always use the appropriate tools to provide educational responses. You have access to medical physiology documents through these tools.
 """
     
-    def _register_tools(self) -> None:
+    @staticmethod
+    def _register_tools(agent: Agent) -> None:
         """Register tools for the coordinator agent."""
         
-        @self.agent.tool
+        @agent.tool
         async def search_medical_content(
             ctx: RunContext[MedicalContext], 
             query: str, 
             max_results: int = 3
         ) -> Dict[str, Any]:
             """Search medical documents using the RAG system."""
-            logger.info(f"Searching medical content for: {query}")
+            logger.info("Searching medical content for: %s", query)
             
             try:
-                results = ctx.deps.rag_system.retrieve_relevant_chunks(query, max_results)
+                prefetches = _prefetched_retrievals.get()
+                prefetched = prefetches.pop((_normalize_query(query), max_results), None) if prefetches else None
+                if prefetched is not None:
+                    results = await prefetched
+                else:
+                    # Retrieval blocks on the embedding API and vector DB, so
+                    # run it in a worker thread to keep the event loop free
+                    results = await asyncio.to_thread(
+                        ctx.deps.rag_system.retrieve_relevant_chunks, query, max_results
+                    )
                 
                 # Track the topic in session context
                 if results.get('results'):
-                    topics = self._extract_topics_from_query(query)
-                    for topic in topics:
-                        ctx.deps.add_current_topic(topic)
+                    ctx.deps.add_current_topics(_extract_topics_from_lower(query.lower()))
                 
                 return {
                     "success": True,
@@ -103,14 +255,14 @@ Always use the appropriate tools to provide educational responses. You have acce
                     "sources_found": len(results.get('results', []))
                 }
             except Exception as e:
-                logger.error(f"Error searching medical content: {e}")
+                logger.error("Error searching medical content: %s", e)
                 return {
                     "success": False,
                     "error": str(e),
                     "query": query
                 }
         
-        @self.agent.tool
+        @agent.tool
         async def generate_basic_quiz(
             ctx: RunContext[MedicalContext],
             topic: str,
@@ -118,21 +270,33 @@ Always use the appropriate tools to provide educational responses. You have acce
             question_count: int = 3
         ) -> Dict[str, Any]:
             """Generate a basic quiz using RAG content (placeholder for Quiz Agent)."""
-            logger.info(f"Generating basic quiz on {topic} with {question_count} questions")
+            logger.info("Generating basic quiz on %s with %s questions", topic, question_count)
             
             try:
-                # Search for relevant content
-                search_results = ctx.deps.rag_system.retrieve_relevant_chunks(
-                    f"quiz questions about {topic}", question_count
+                # Search for content on a different facet of the topic per
+                # question, as one batched embedding call and vector query
+                facets = _QUIZ_FACETS[:max(1, question_count)]
+                per_facet = -(-question_count // len(facets))  # Ceiling division
+                batch_results = await asyncio.to_thread(
+                    ctx.deps.rag_system.retrieve_relevant_chunks_batch,
+                    [f"{topic} {facet}" for facet in facets], per_facet
                 )
                 
+                # Facets can surface the same chunk; count each source once
+                sources = {
+                    (metadata.get('document_name'), metadata.get('chunk_index'))
+                    for search_results in batch_results
+                    for r in search_results.get('results', [])
+                    for metadata in (r.get('metadata') or {},)
+                }
+                
                 # For now, create a simple placeholder response
                 # This will be replaced by actual Quiz Agent delegation
                 quiz_data = {
                     "topic": topic,
                     "difficulty": difficulty,
                     "question_count": question_count,
-                    "sources_used": len(search_results.get('results', [])),
+                    "sources_used": len(sources),
                     "placeholder": True,
                     "message": f"Generated {question_count} {difficulty} questions about {topic}"
                 }
@@ -144,28 +308,35 @@ Always use the appropriate tools to provide educational responses. You have acce
                 return quiz_data
                 
             except Exception as e:
-                logger.error(f"Error generating quiz: {e}")
+                logger.error("Error generating quiz: %s", e)
                 return {"error": str(e), "topic": topic}
         
-        @self.agent.tool
+        @agent.tool
         async def get_detailed_explanation(
             ctx: RunContext[MedicalContext],
             question: str,
             complexity_level: str = "intermediate"
         ) -> Dict[str, Any]:
             """Provide detailed medical explanation (placeholder for Tutor Agent)."""
-            logger.info(f"Generating explanation for: {question}")
+            logger.info("Generating explanation for: %s", question)
             
             try:
                 # Use RAG system to generate complete response
                 explanation_query = f"explain {question} in detail"
-                full_response = ctx.deps.rag_system.answer_question(explanation_query, 3)
+                full_response = await asyncio.to_thread(
+                    ctx.deps.rag_system.answer_question, explanation_query, 3
+                )
                 
                 if full_response.get('answer') and not full_response.get('error'):
                     explanation_data = {
                         "question": question,
                         "explanation": full_response['answer'],
-                        "sources": [r['metadata']['document_name'] for r in full_response.get('sources', [])],
+                        # Skip sources without a document name rather than
+                        # failing the whole explanation
+                        "sources": [
+                            name for r in full_response.get('sources', ())
+                            if (name := (r.get('metadata') or {}).get('document_name'))
+                        ],
                         "complexity_level": complexity_level,
                         "confidence": 0.85  # Placeholder confidence score
                     }
@@ -179,22 +350,20 @@ Always use the appropriate tools to provide educational responses. You have acce
                     }
                 
                 # Extract and track topics
-                topics = self._extract_topics_from_query(question)
-                for topic in topics:
-                    ctx.deps.add_current_topic(topic)
+                ctx.deps.add_current_topics(_extract_topics_from_lower(question.lower()))
                 
                 return explanation_data
                 
             except Exception as e:
-                logger.error(f"Error generating explanation: {e}")
+                logger.error("Error generating explanation: %s", e)
                 return {"error": str(e), "question": question}
         
-        @self.agent.tool
+        @agent.tool
         async def check_learning_progress(
             ctx: RunContext[MedicalContext]
         ) -> Dict[str, Any]:
             """Check current learning progress (placeholder for Progress Agent)."""
-            logger.info(f"Checking progress for user: {ctx.deps.user_id}")
+            logger.info("Checking progress for user: %s", ctx.deps.user_id)
             
             try:
                 profile = ctx.deps.learning_profile
@@ -208,99 +377,52 @@ Always use the appropriate tools to provide educational responses. You have acce
                     "learning_streak": profile.learning_streak,
                     "session_topics": ctx.deps.current_topics,
                     "total_sessions": profile.total_sessions,
-                    "recommendations": self._generate_recommendations(ctx.deps)
+                    "recommendations": _build_recommendations(ctx.deps)
                 }
                 
                 return progress_data
                 
             except Exception as e:
-                logger.error(f"Error checking progress: {e}")
+                logger.error("Error checking progress: %s", e)
                 return {"error": str(e)}
     
     def _extract_topics_from_query(self, query: str) -> List[str]:
         """Extract medical topics from user query."""
-        # Simple topic extraction - can be enhanced with NLP
-        medical_terms = [
-            "neurophysiology", "cardiovascular", "respiratory", "endocrine",
-            "musculoskeletal", "digestive", "renal", "immune", "reproduction",
-            "metabolism", "homeostasis", "synapse", "neuron", "hormone",
-            "blood", "heart", "lung", "kidney", "muscle", "bone"
-        ]
-        
-        topics = []
-        query_lower = query.lower()
-        
-        for term in medical_terms:
-            if term in query_lower:
-                topics.append(term)
-        
-        return topics
+        return list(_extract_topics_from_lower(query.lower()))
     
     def _generate_recommendations(self, context: MedicalContext) -> List[str]:
         """Generate learning recommendations based on context."""
-        recommendations = []
-        
-        # Knowledge gaps recommendations
-        if context.learning_profile.knowledge_gaps:
-            recommendations.append(
-                f"Review {len(context.learning_profile.knowledge_gaps)} topics that need attention"
-            )
-        
-        # Difficulty progression
-        for topic, score in context.learning_profile.mastery_scores.items():
-            if score > 0.8:
-                recommendations.append(f"Ready for advanced {topic} concepts")
-            elif score < 0.4:
-                recommendations.append(f"Practice basic {topic} fundamentals")
-        
-        # Session continuity
-        if context.current_topics:
-            recommendations.append(f"Continue exploring {', '.join(context.current_topics)}")
-        
-        return recommendations[:3]  # Limit to top 3 recommendations
+        return _build_recommendations(context)
     
     def _parse_learning_intent(self, user_input: str, context: MedicalContext) -> LearningIntent:
         """Parse user input to determine learning intent."""
         input_lower = user_input.lower()
+        intent_type = _classify_intent(input_lower)
         
-        # Quiz intent patterns
-        quiz_patterns = ["quiz", "test", "question", "practice", "assessment"]
-        if any(pattern in input_lower for pattern in quiz_patterns):
+        if intent_type == "quiz":
             return LearningIntent(
                 intent_type="quiz",
-                topic=self._extract_primary_topic(user_input),
+                topic=_extract_primary_topic_from_lower(input_lower),
                 difficulty=context.preferences.preferred_difficulty,
                 specific_request=user_input
             )
         
-        # Explanation intent patterns
-        explain_patterns = ["explain", "what is", "how does", "why", "definition", "describe"]
-        if any(pattern in input_lower for pattern in explain_patterns):
-            return LearningIntent(
-                intent_type="explanation",
-                topic=self._extract_primary_topic(user_input),
-                specific_request=user_input
-            )
-        
-        # Progress intent patterns
-        progress_patterns = ["progress", "how am i doing", "stats", "performance", "mastery"]
-        if any(pattern in input_lower for pattern in progress_patterns):
+        if intent_type == "progress":
             return LearningIntent(
                 intent_type="progress",
                 specific_request=user_input
             )
         
-        # Default to general conversation
+        # Explanation or general conversation
         return LearningIntent(
-            intent_type="general",
-            topic=self._extract_primary_topic(user_input),
+            intent_type=intent_type,
+            topic=_extract_primary_topic_from_lower(input_lower),
             specific_request=user_input
         )
     
     def _extract_primary_topic(self, text: str) -> Optional[str]:
         """Extract the primary medical topic from text."""
-        topics = self._extract_topics_from_query(text)
-        return topics[0] if topics else None
+        return _extract_primary_topic_from_lower(text.lower())
     
     async def process_user_input(
         self, 
@@ -317,29 +439,44 @@ Always use the appropriate tools to provide educational responses. You have acce
         Returns:
             Coordinated learning response
         """
-        logger.info(f"Processing user input: {user_input[:100]}...")
+        logger.info("Processing user input: %.100s...", user_input)
         
         try:
-            # Parse learning intent
-            intent = self._parse_learning_intent(user_input, context)
+            # Only the intent type is needed to decide on prefetching, so skip
+            # building a LearningIntent (see _parse_learning_intent)
+            intent_type = _classify_intent(user_input.lower())
+            
+            # Start retrieving for the raw question while the model routes the
+            # request. Only general searches go to search_medical_content,
+            # which picks it up if it asks the same; explanations use
+            # answer_question and would never read it
+            prefetches = {}
+            if intent_type == "general":
+                self._start_prefetch(user_input, context, prefetches)
             
             # Run the coordinator agent
-            result = await self.agent.run(
-                user_input,
-                deps=context
-            )
+            token = _prefetched_retrievals.set(prefetches)
+            try:
+                result = await self.agent.run(
+                    user_input,
+                    deps=context
+                )
+            finally:
+                _prefetched_retrievals.reset(token)
+                self._discard_prefetches(prefetches)
             
-            # Update session history
+            # Update session history. The response model is stored as is: the
+            # history is in-memory only, so a full dict copy per turn buys nothing
             context.session_history.add_interaction(
                 user_input,
-                {"agent": "coordinator", "response": result.data.dict()},
+                {"agent": "coordinator", "response": result.data},
                 context.current_topics
             )
             
             return result.data
             
         except Exception as e:
-            logger.error(f"Error processing user input: {e}")
+            logger.error("Error processing user input: %s", e)
             
             # Return error response
             return LearningResponse(
@@ -350,20 +487,171 @@ Always use the appropriate tools to provide educational responses. You have acce
                 conversation_text=f"I encountered an error processing your request: {e}"
             )
     
-    async def handle_conversation(
+    def _start_prefetch(
+        self,
+        query: str,
+        context: MedicalContext,
+        prefetches: Dict[Tuple[str, int], asyncio.Task]
+    ) -> None:
+        """Begin retrieving chunks for a query in the background."""
+        key = (_normalize_query(query), PREFETCH_RESULTS)
+        if key not in prefetches:
+            prefetches[key] = asyncio.create_task(
+                asyncio.to_thread(context.rag_system.retrieve_relevant_chunks, query, PREFETCH_RESULTS)
+            )
+    
+    def _discard_prefetches(self, prefetches: Dict[Tuple[str, int], asyncio.Task]) -> None:
+        """
+        Drop prefetched retrievals that no tool used.
+        
+        The worker thread can't be interrupted, so unfinished retrievals are
+        left to complete; their results (or errors) are simply ignored.
+        """
+        for task in prefetches.values():
+            task.add_done_callback(_ignore_result)
+        prefetches.clear()
+    
+    def _lookup_cached_answer(
         self,
         message: str,
         context: MedicalContext
-    ) -> str:
+    ) -> Tuple[Optional[Dict[str, Any]], str, Optional[List[float]]]:
         """
-        Handle a conversational message and return a text response.
+        Look up an earlier answer to a question.
+        
+        Repeated questions (ignoring case and whitespace) are served from the
+        response cache. When the RAG system can embed queries, rephrasings of
+        an earlier question from the same user are matched by embedding
+        similarity.
         
         Args:
-            message: User's message
+            message: User's question
             context: Medical learning context
             
         Returns:
-            Text response for conversation
+            Tuple of (cached RAG response or None, normalized query, query
+            embedding or None) - the last two are reused by _store_answer
+        """
+        query = _normalize_query(message)
+        cached = self.response_cache.get_query_result(query, context.user_id)
+        if cached is not None:
+            logger.info("Serving answer from response cache")
+            return cached, query, None
+        
+        query_embedding = None
+        embed_query = getattr(context.rag_system, 'embed_query', None)
+        if embed_query is not None:
+            # Retrieval reuses this embedding from the embeddings cache on a miss
+            query_embedding = embed_query(message)
+            cached = self.semantic_cache.get(query_embedding, context.user_id)
+            if cached is not None:
+                logger.info("Serving answer for a similar earlier question")
+                self.response_cache.set_query_result(query, cached, context.user_id)
+                return cached, query, query_embedding
+        
+        return None, query, query_embedding
+    
+    def _store_answer(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]],
+        rag_response: Dict[str, Any],
+        context: MedicalContext
+    ) -> None:
+        """Cache a RAG response if it holds a successful answer."""
+        if rag_response.get('answer') and not rag_response.get('error'):
+            self.response_cache.set_query_result(query, rag_response, context.user_id)
+            if query_embedding is not None:
+                self.semantic_cache.set(query, query_embedding, rag_response, context.user_id)
+    
+    def _answer_with_cache(self, message: str, context: MedicalContext) -> Dict[str, Any]:
+        """
+        Answer a question with the RAG system, reusing recent answers.
+        
+        Only successful answers are cached.
+        
+        Args:
+            message: User's question
+            context: Medical learning context
+            
+        Returns:
+            RAG response with answer and sources
+        """
+        cached, query, query_embedding = self._lookup_cached_answer(message, context)
+        if cached is not None:
+            return cached
+        
+        rag_response = context.rag_system.answer_question(message, 3)
+        self._store_answer(query, query_embedding, rag_response, context)
+        
+        return rag_response
+    
+    async def _stream_rag_answer(self, message: str, context: MedicalContext) -> AsyncIterator[str]:
+        """
+        Answer a question with the RAG system, yielding the answer as Gemini
+        generates it.
+        
+        Cached answers are yielded whole. RAG systems without
+        generate_answer_stream fall back to a single blocking answer.
+        
+        Args:
+            message: User's question
+            context: Medical learning context
+            
+        Yields:
+            Chunks of the answer text
+        """
+        rag_system = context.rag_system
+        generate_answer_stream = getattr(rag_system, 'generate_answer_stream', None)
+        if generate_answer_stream is None:
+            rag_response = await asyncio.to_thread(self._answer_with_cache, message, context)
+            if rag_response.get('answer') and not rag_response.get('error'):
+                yield rag_response['answer']
+            else:
+                yield _NO_ANSWER_MESSAGE
+            return
+        
+        cached, query, query_embedding = await asyncio.to_thread(
+            self._lookup_cached_answer, message, context
+        )
+        if cached is not None:
+            yield cached['answer']
+            return
+        
+        retrieval_results = await asyncio.to_thread(
+            rag_system.retrieve_relevant_chunks, message, 3
+        )
+        if not retrieval_results.get('results'):
+            yield _NO_ANSWER_MESSAGE
+            return
+        rag_context = rag_system.format_context(retrieval_results)
+        
+        answer_parts = []
+        async for chunk in _iterate_in_thread(generate_answer_stream(message, rag_context)):
+            answer_parts.append(chunk)
+            yield chunk
+        
+        self._store_answer(query, query_embedding, {
+            'query': message,
+            'answer': "".join(answer_parts),
+            'sources': retrieval_results['results'],
+            'context': rag_context
+        }, context)
+    
+    async def handle_conversation_stream(
+        self,
+        message: str,
+        context: MedicalContext
+    ) -> AsyncIterator[str]:
+        """
+        Handle a conversational message, yielding the response as it is generated.
+        
+        Args:
+            message: User's message
+            context: Medical learning context
+            
+        Yields:
+            Chunks of the text response for conversation
         """
         try:
             # Simplified approach - directly use RAG system for now
@@ -371,26 +659,46 @@ Always use the appropriate tools to provide educational responses. You have acce
                 # Extract topic and generate simple quiz response
                 topics = self._extract_topics_from_query(message)
                 topic = topics[0] if topics else "general physiology"
-                return f"I'd create a quiz about {topic}, but the Quiz Agent is still being implemented. For now, try asking me to explain a specific topic!"
+                yield f"I'd create a quiz about {topic}, but the Quiz Agent is still being implemented. For now, try asking me to explain a specific topic!"
             
             elif "progress" in message.lower():
-                return f"Your current learning progress: You've covered {len(context.current_topics)} topics in this session. The Progress Agent is being developed for detailed analytics."
+                yield f"Your current learning progress: You've covered {len(context.current_topics)} topics in this session. The Progress Agent is being developed for detailed analytics."
             
             else:
                 # Use RAG system directly for explanations
+                answer_started = False
                 try:
-                    rag_response = context.rag_system.answer_question(message, 3)
-                    if rag_response.get('answer') and not rag_response.get('error'):
-                        return rag_response['answer']
-                    else:
-                        return "I couldn't find specific information about that topic in the medical documents. Could you try asking about neurophysiology, motor control, or other physiology topics?"
+                    # The blocking RAG calls run off the event loop (the
+                    # response caches are thread-safe)
+                    async for chunk in self._stream_rag_answer(message, context):
+                        answer_started = True
+                        yield chunk
                 except Exception as rag_error:
-                    logger.error(f"RAG system error: {rag_error}")
-                    return f"I'm having trouble accessing the medical documents right now. Error: {rag_error}"
+                    logger.error("RAG system error: %s", rag_error)
+                    # Don't append the error to a partially streamed answer
+                    if not answer_started:
+                        yield f"I'm having trouble accessing the medical documents right now. Error: {rag_error}"
                 
         except Exception as e:
-            logger.error(f"Error handling conversation: {e}")
-            return f"I'm sorry, I encountered an error: {e}"
+            logger.error("Error handling conversation: %s", e)
+            yield f"I'm sorry, I encountered an error: {e}"
+    
+    async def handle_conversation(
+        self,
+        message: str,
+        context: MedicalContext
+    ) -> str:
+        """
+        Handle a conversational message and return a text response.
+        
+        Args:
+            message: User's message
+            context: Medical learning context
+            
+        Returns:
+            Text response for conversation
+        """
+        return "".join([chunk async for chunk in self.handle_conversation_stream(message, context)])
 
 
 def create_coordinator_agent(
@@ -418,7 +726,7 @@ def create_coordinator_agent(
         rag_system=rag_system
     )
     
-    logger.info(f"Created coordinator agent for user: {user_id}")
+    logger.info("Created coordinator agent for user: %s", user_id)
     
     return coordinator, context
 
@@ -442,12 +750,15 @@ async def main():
         "How am I doing with my learning progress?"
     ]
     
-    for message in test_messages:
+    # The messages are independent, so send them concurrently
+    responses = await asyncio.gather(
+        *(coordinator.handle_conversation(message, context) for message in test_messages)
+    )
+    
+    for message, response in zip(test_messages, responses):
         print(f"\nUser: {message}")
-        response = await coordinator.handle_conversation(message, context)
         print(f"MedMind: {response}")
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
\ No newline at end of file
@@ -4,8 +4,9 @@ Uses pydantic-settings for type-safe configuration with environment variables.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 try:
     from pydantic_settings import BaseSettings
@@ -34,6 +35,13 @@ class Settings(BaseSettings):
     gemini_embedding_model: str = "models/text-embedding-004"
     gemini_pdf_model: str = "gemini-2.5-flash-preview-04-17"
     
+    # Local embedding model (ONNX export directory used instead of the Gemini API)
+    local_embedding_model_dir: Optional[str] = None
+    
+    # Embedding storage format searched at query time: fp32 (ChromaDB index),
+    # or a bf16/int8/binary copy written next to it when documents are indexed
+    embedding_dtype: Literal["fp32", "bf16", "int8", "binary"] = "fp32"
+    
     # Database Configuration
     vector_db_path: str = "./data/vector_db"
     collection_name: str = "physiology_documents"
@@ -71,24 +79,21 @@ class Settings(BaseSettings):
     @field_validator('data_dir', 'raw_data_dir', 'processed_data_dir', 'uploads_dir', 'vector_db_path')
     @classmethod
     def create_directories(cls, v):
-        """Ensure directories exist."""
-        Path(v).mkdir(parents=True, exist_ok=True)
+        """Ensure directories exist (skipped when MEDMIND_SKIP_MKDIR=1, e.g. read-only deployments)."""
+        if os.getenv("MEDMIND_SKIP_MKDIR") != "1":
+            Path(v).mkdir(parents=True, exist_ok=True)
         return v
     
     model_config = {"case_sensitive": False}
 
 
-# Global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get the application settings."""
-    return settings
+    """Get the application settings (loaded and validated once, on first use)."""
+    return Settings()
 
 
 def reload_settings() -> Settings:
     """Reload settings (useful for testing)."""
-    global settings
-    settings = Settings()
-    return settings
\ No newline at end of file
+    get_settings.cache_clear()
+    return get_settings()
@@ -5,6 +5,8 @@ Implements semantic chunking with medical concept awareness and overlapping wind
 
 import re
 import json
+import bisect
+import functools
 from typing import List, Dict, Any, Set, Tuple
 from pathlib import Path
 from dataclasses import dataclass
@@ -14,8 +16,29 @@ from physiology_rag.utils.logging import get_logger
 
 logger = get_logger("advanced_chunking")
 
+# Whitespace after sentence-ending punctuation, i.e. between sentences
+_SENTENCE_SEPARATOR_RE = re.compile(r'(?<=[.!?])\s+')
 
-@dataclass
+# Runs of sentence-ending punctuation
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+
+def _pattern_terms(pattern: str) -> List[str]:
+    """
+    List the literal terms of one of the word-list patterns below.
+    
+    Args:
+        pattern: Word-bounded alternation of words, with whitespace runs
+            between the words of a phrase
+        
+    Returns:
+        Lowercase terms with words separated by single spaces
+    """
+    alternatives = pattern[len(r'\b(?:'):-len(r')\b')]
+    return [term.replace(r'\s+', ' ').lower() for term in alternatives.split('|')]
+
+
+@dataclass(slots=True)
 class ChunkMetadata:
     """Metadata for advanced chunks."""
     start_idx: int
@@ -30,6 +53,9 @@ class ChunkMetadata:
 class MedicalConceptDetector:
     """Detects medical concepts and terminology in text."""
     
+    # Texts whose detected concepts are remembered
+    CACHE_SIZE = 4096
+    
     def __init__(self):
         """Initialize with medical terminology patterns."""
         self.medical_patterns = {
@@ -61,12 +87,42 @@ class MedicalConceptDetector:
             ]
         }
         
-        # Compile patterns for efficiency
-        self.compiled_patterns = {}
+        # Map each term (lowercase, single-spaced) to the categories it belongs
+        # to; a few terms such as "metabolism" appear in more than one
+        self.term_categories: Dict[str, List[str]] = {}
         for category, patterns in self.medical_patterns.items():
-            self.compiled_patterns[category] = [
-                re.compile(pattern, re.IGNORECASE) for pattern in patterns
-            ]
+            for pattern in patterns:
+                for term in _pattern_terms(pattern):
+                    categories = self.term_categories.setdefault(term, [])
+                    if category not in categories:
+                        categories.append(category)
+        
+        # Bit positions for concept masks
+        self.term_ids: Dict[str, int] = {term: i for i, term in enumerate(self.term_categories)}
+        
+        # Single-word terms inside multi-word ones ("heart" in "heart rate"),
+        # as (word index, term), since a single scan reports only the longer match
+        self._nested_terms: Dict[str, List[Tuple[int, str]]] = {}
+        for term in self.term_categories:
+            words = term.split()
+            nested = [(i, word) for i, word in enumerate(words) if word in self.term_categories]
+            if len(words) > 1 and nested:
+                self._nested_terms[term] = nested
+        
+        # One alternation over every term so the text is scanned once. Longer
+        # terms come first so "stroke volume" wins over "stroke"
+        self.concept_pattern = re.compile(
+            r'\b(?:' + '|'.join(
+                r'\s+'.join(map(re.escape, term.split()))
+                for term in sorted(self.term_categories, key=len, reverse=True)
+            ) + r')\b',
+            re.IGNORECASE
+        )
+        
+        # Chunking scans the same text several times (each sentence on both
+        # sides of a boundary, each chunk for concepts and density), so
+        # remember recent results
+        self._scan = functools.lru_cache(maxsize=self.CACHE_SIZE)(self._scan_text)
         
         logger.info("Initialized MedicalConceptDetector with medical terminology patterns")
     
@@ -80,23 +136,73 @@ class MedicalConceptDetector:
         Returns:
             Dictionary of detected concepts by category
         """
-        detected = {}
+        return {category: list(matches) for category, matches in self._scan(text)}
+    
+    def count_concepts(self, text: str) -> int:
+        """
+        Count the distinct medical concepts in text, summed over categories.
         
-        for category, patterns in self.compiled_patterns.items():
-            matches = set()
-            for pattern in patterns:
-                found = pattern.findall(text)
-                matches.update(found)
-            detected[category] = list(matches)
+        Equivalent to summing the list lengths from detect_concepts, without
+        building the lists.
+        
+        Args:
+            text: Input text to analyze
+            
+        Returns:
+            Number of detected concepts
+        """
+        return sum(len(matches) for _, matches in self._scan(text))
+    
+    def concept_mask(self, text: str) -> int:
+        """
+        Get the set of medical terms in text as a bitmask.
+        
+        Bit i is set when the term with id i in term_ids occurs. Terms are
+        compared case-insensitively, so "Heart" and "heart" are one concept.
+        
+        Args:
+            text: Input text to analyze
+            
+        Returns:
+            Bitmask of detected terms
+        """
+        mask = 0
+        for _, matches in self._scan(text):
+            for match in matches:
+                mask |= 1 << self.term_ids[" ".join(match.split()).lower()]
+        return mask
+    
+    def _scan_text(self, text: str) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+        """
+        Find the concepts in text, as an immutable structure safe to cache.
         
-        return detected
+        Args:
+            text: Input text to analyze
+            
+        Returns:
+            (category, matches) pairs in category order
+        """
+        detected = {category: set() for category in self.medical_patterns}
+        
+        for match in self.concept_pattern.findall(text):
+            words = match.split()
+            term = " ".join(words).lower()
+            for category in self.term_categories[term]:
+                detected[category].add(match)
+            for index, word in self._nested_terms.get(term, ()):
+                for category in self.term_categories[word]:
+                    detected[category].add(words[index])
+        
+        return tuple((category, tuple(matches)) for category, matches in detected.items())
     
-    def calculate_concept_density(self, text: str) -> float:
+    def calculate_concept_density(self, text: str, total_concepts: int = None) -> float:
         """
         Calculate density of medical concepts in text.
         
         Args:
             text: Input text to analyze
+            total_concepts: Concept count if already known (defaults to
+                count_concepts(text))
             
         Returns:
             Concept density score (0-1)
@@ -104,9 +210,8 @@ class MedicalConceptDetector:
         if not text:
             return 0.0
         
-        total_concepts = 0
-        for category_concepts in self.detect_concepts(text).values():
-            total_concepts += len(category_concepts)
+        if total_concepts is None:
+            total_concepts = self.count_concepts(text)
         
         # Normalize by text length (concepts per 100 words)
         words = len(text.split())
@@ -127,31 +232,30 @@ class MedicalConceptDetector:
         Returns:
             True if boundary exists between different medical concepts
         """
-        concepts_before = self.detect_concepts(text_before)
-        concepts_after = self.detect_concepts(text_after)
-        
-        # Check if concepts differ significantly
-        all_before = set()
-        all_after = set()
-        
-        for concepts in concepts_before.values():
-            all_before.update(concepts)
-        
-        for concepts in concepts_after.values():
-            all_after.update(concepts)
+        return self.is_mask_boundary(self.concept_mask(text_before), self.concept_mask(text_after))
+    
+    @staticmethod
+    def is_mask_boundary(concepts_before: int, concepts_after: int) -> bool:
+        """
+        Determine if two concept masks (see concept_mask) differ enough to
+        mark a boundary.
         
-        # Calculate concept overlap
-        if not all_before and not all_after:
+        Args:
+            concepts_before: Concept mask of the text before the boundary
+            concepts_after: Concept mask of the text after the boundary
+            
+        Returns:
+            True if less than half of the concepts are shared
+        """
+        # Intersection and union are single integer operations
+        all_concepts = concepts_before | concepts_after
+        if not all_concepts:
             return False
         
-        overlap = len(all_before & all_after)
-        total = len(all_before | all_after)
-        
-        if total == 0:
-            return False
+        overlap = (concepts_before & concepts_after).bit_count()
         
         # If overlap is less than 50%, consider it a boundary
-        return (overlap / total) < 0.5
+        return (overlap / all_concepts.bit_count()) < 0.5
 
 
 class SemanticChunker:
@@ -184,21 +288,31 @@ class SemanticChunker:
             List of character positions for semantic boundaries
         """
         boundaries = []
-        sentences = re.split(r'(?<=[.!?])\s+', text)
         
-        current_pos = 0
-        for i, sentence in enumerate(sentences):
+        # Sentence spans from the whitespace that follows sentence-ending
+        # punctuation, so offsets stay exact whatever the separator length
+        starts = [0]
+        ends = []
+        for separator in _SENTENCE_SEPARATOR_RE.finditer(text):
+            ends.append(separator.start())
+            starts.append(separator.end())
+        ends.append(len(text))
+        
+        # Each sentence's concepts are looked up once and reused as the
+        # "before" side of the next pair
+        prev_mask = None
+        for start, end in zip(starts, ends):
             # Check for paragraph boundaries
-            if '\n\n' in sentence:
-                boundaries.append(current_pos + sentence.find('\n\n'))
+            paragraph_break = text.find('\n\n', start, end)
+            if paragraph_break != -1:
+                boundaries.append(paragraph_break)
             
             # Check for medical concept boundaries
-            if i > 0:
-                prev_sentence = sentences[i-1]
-                if self.concept_detector.is_medical_boundary(prev_sentence, sentence):
-                    boundaries.append(current_pos)
+            mask = self.concept_detector.concept_mask(text[start:end])
+            if prev_mask is not None and self.concept_detector.is_mask_boundary(prev_mask, mask):
+                boundaries.append(start)
             
-            current_pos += len(sentence) + 1  # +1 for space
+            prev_mask = mask
         
         return sorted(set(boundaries))
     
@@ -226,18 +340,16 @@ class SemanticChunker:
         all_boundaries = [0] + boundaries + [text_length]
         all_boundaries = sorted(set(all_boundaries))
         
-        i = 0
-        while i < len(all_boundaries) - 1:
-            chunk_start = all_boundaries[i]
+        chunk_start = 0
+        previous_end = 0
+        while chunk_start < text_length:
             chunk_end = chunk_start + self.chunk_size
             
-            # Find the best boundary within chunk size
-            best_boundary = None
-            for boundary in all_boundaries:
-                if chunk_start < boundary <= chunk_end:
-                    best_boundary = boundary
-                elif boundary > chunk_end:
-                    break
+            # Find the best (last) boundary within chunk size; the boundaries
+            # are sorted, so binary search for the ones in range
+            first = bisect.bisect_right(all_boundaries, chunk_start)
+            last = bisect.bisect_right(all_boundaries, chunk_end)
+            best_boundary = all_boundaries[last - 1] if last > first else None
             
             if best_boundary:
                 chunk_end = best_boundary
@@ -256,23 +368,15 @@ class SemanticChunker:
             
             chunk_text = text[chunk_start:chunk_end]
             
-            # Detect medical concepts in chunk
+            # Detect medical concepts in chunk once; density and the
+            # processor's concept analysis reuse the result
             concepts = self.concept_detector.detect_concepts(chunk_text)
             all_concepts = []
             for concept_list in concepts.values():
                 all_concepts.extend(concept_list)
             
-            # Create chunk metadata
-            chunk_metadata = ChunkMetadata(
-                start_idx=chunk_start,
-                end_idx=chunk_end,
-                medical_concepts=all_concepts,
-                section_hierarchy=metadata.get('section_hierarchy', []) if metadata else [],
-                concept_density=self.concept_detector.calculate_concept_density(chunk_text),
-                overlap_with_previous=chunk_start > 0 and chunk_start < all_boundaries[i] + self.overlap_size,
-                overlap_with_next=chunk_end < text_length
-            )
-            
+            # Build the chunk dict directly; a ChunkMetadata per chunk would
+            # only be unpacked into it again
             chunk_dict = {
                 'text': chunk_text,
                 'type': 'semantic',
@@ -280,9 +384,10 @@ class SemanticChunker:
                 'start_idx': chunk_start,
                 'end_idx': chunk_end,
                 'medical_concepts': all_concepts,
-                'concept_density': chunk_metadata.concept_density,
-                'overlap_previous': chunk_metadata.overlap_with_previous,
-                'overlap_next': chunk_metadata.overlap_with_next
+                'concept_analysis': concepts,
+                'concept_density': self.concept_detector.calculate_concept_density(chunk_text, len(all_concepts)),
+                'overlap_previous': chunk_start < previous_end,
+                'overlap_next': chunk_end < text_length
             }
             
             # Add original metadata
@@ -299,20 +404,18 @@ class SemanticChunker:
             if chunk_end >= text_length:
                 break
             
-            # Calculate next start position with overlap
-            next_start = max(chunk_end - self.overlap_size, chunk_start + 1)
-            
-            # Find the next boundary index
-            next_boundary_idx = None
-            for j, boundary in enumerate(all_boundaries):
-                if boundary > next_start:
-                    next_boundary_idx = j
-                    break
+            # Calculate next start position with overlap; chunks shorter than
+            # the overlap are not overlapped
+            next_start = chunk_end - self.overlap_size
+            if next_start <= chunk_start:
+                next_start = chunk_end
             
-            if next_boundary_idx is None:
-                break
-            
-            i = next_boundary_idx - 1 if next_boundary_idx > 0 else 0
+            # Start at the last boundary at or before that position. If that is
+            # this chunk's own start, start at the position itself instead so
+            # the loop always moves forward
+            previous_end = chunk_end
+            boundary = all_boundaries[bisect.bisect_right(all_boundaries, next_start) - 1]
+            chunk_start = boundary if boundary > chunk_start else next_start
         
         logger.info(f"Created {len(chunks)} overlapping semantic chunks")
         return chunks
@@ -358,7 +461,8 @@ class AdvancedDocumentProcessor:
             overlap_ratio: Overlap ratio between chunks
         """
         self.chunker = SemanticChunker(chunk_size, overlap_ratio)
-        self.concept_detector = MedicalConceptDetector()
+        # Share the chunker's detector so chunks it already scanned are cached
+        self.concept_detector = self.chunker.concept_detector
         
         logger.info("Initialized AdvancedDocumentProcessor")
     
@@ -389,8 +493,9 @@ class AdvancedDocumentProcessor:
             chunk['chunk_index'] = i
             chunk['total_chunks'] = len(chunks)
             
-            # Add concept analysis
-            chunk['concept_analysis'] = self.concept_detector.detect_concepts(chunk['text'])
+            # Add concept analysis (the semantic chunker already provides it)
+            if 'concept_analysis' not in chunk:
+                chunk['concept_analysis'] = self.concept_detector.detect_concepts(chunk['text'])
             
             # Add readability metrics (simple implementation)
             chunk['readability_score'] = self._calculate_readability(chunk['text'])
@@ -418,7 +523,7 @@ class AdvancedDocumentProcessor:
             return 0.0
         
         # Simple metrics: average sentence length and word complexity
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENTENCE_END_RE.split(text)
         words = text.split()
         
         if not sentences or not words:
@@ -427,7 +532,7 @@ class AdvancedDocumentProcessor:
         avg_sentence_length = len(words) / len(sentences)
         
         # Count complex words (>6 characters)
-        complex_words = sum(1 for word in words if len(word) > 6)
+        complex_words = len([word for word in words if len(word) > 6])
         complexity_ratio = complex_words / len(words) if words else 0
         
         # Simple readability score (inverse of complexity)
@@ -6,12 +6,14 @@ Implements in-memory and optional Redis caching for performance optimization.
 import json
 import hashlib
 import time
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import threading
 from collections import OrderedDict
 
+import numpy as np
+
 from physiology_rag.config.settings import get_settings
 from physiology_rag.utils.logging import get_logger
 
@@ -132,7 +134,7 @@ class InMemoryCache:
             while len(self.cache) > self.max_size:
                 oldest_key = next(iter(self.cache))
                 del self.cache[oldest_key]
-                logger.debug(f"Evicted cache entry: {oldest_key}")
+                logger.debug("Evicted cache entry: %s", oldest_key)
     
     def clear(self) -> None:
         """Clear all cache entries."""
@@ -322,6 +324,139 @@ class QueryCache:
         return self.cache.get_stats()
 
 
+class SemanticQueryCache:
+    """
+    Cache for query results matched by embedding similarity.
+    
+    A lookup returns the result of the most similar cached query when its
+    cosine similarity reaches the threshold, so rephrased questions can reuse
+    an earlier answer. Entries are evicted least recently used first and
+    expire after the TTL.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: int = 3600,
+        similarity_threshold: float = 0.92
+    ):
+        """
+        Initialize semantic query cache.
+        
+        Args:
+            max_entries: Maximum cached queries
+            ttl_seconds: Time-to-live in seconds
+            similarity_threshold: Minimum cosine similarity for a hit
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        # key -> (context_hash, unit query embedding, result, timestamp)
+        self.entries: OrderedDict[str, Tuple[str, np.ndarray, Any, float]] = OrderedDict()
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        
+        logger.info(
+            f"Initialized SemanticQueryCache with max_entries={max_entries}, "
+            f"ttl={ttl_seconds}s, threshold={similarity_threshold}"
+        )
+    
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        """Scale an embedding to unit length so dot products are cosine similarities."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def _evict_expired(self, current_time: float) -> None:
+        """Drop entries older than the TTL (caller holds the lock)."""
+        expired = [
+            key for key, entry in self.entries.items()
+            if current_time - entry[3] > self.ttl_seconds
+        ]
+        for key in expired:
+            del self.entries[key]
+    
+    def get(self, query_embedding: Sequence[float], context_hash: str = None) -> Optional[Any]:
+        """
+        Get the cached result of the most similar query.
+        
+        Args:
+            query_embedding: Embedding of the new query
+            context_hash: Optional context hash; only entries with the same hash match
+            
+        Returns:
+            Cached result or None if no query is similar enough
+        """
+        context_hash = context_hash or 'default'
+        query = self._normalize(query_embedding)
+        
+        with self.lock:
+            self._evict_expired(time.time())
+            
+            keys = [key for key, entry in self.entries.items() if entry[0] == context_hash]
+            if keys:
+                scores = np.stack([self.entries[key][1] for key in keys]) @ query
+                best = int(np.argmax(scores))
+                
+                if scores[best] >= self.similarity_threshold:
+                    key = keys[best]
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return self.entries[key][2]
+            
+            self.misses += 1
+            return None
+    
+    def set(
+        self,
+        key: str,
+        query_embedding: Sequence[float],
+        result: Any,
+        context_hash: str = None
+    ) -> None:
+        """
+        Cache a query result.
+        
+        Args:
+            key: Query identifier (e.g. the normalized query text)
+            query_embedding: Embedding of the query
+            result: Query result
+            context_hash: Optional context hash for the entry
+        """
+        entry = (context_hash or 'default', self._normalize(query_embedding), result, time.time())
+        
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+            
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Clear all cache entries."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self.lock:
+            total_requests = self.hits + self.misses
+            hit_rate = self.hits / total_requests if total_requests > 0 else 0
+            
+            return {
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': hit_rate,
+                'total_requests': total_requests
+            }
+
+
 class CacheManager:
     """Unified cache manager for all caching needs."""
     
@@ -8,6 +8,11 @@ import re
 from pathlib import Path
 from typing import Any, Dict, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from physiology_rag.config.settings import get_settings
 from physiology_rag.utils.logging import get_logger
 from physiology_rag.core.advanced_chunking import AdvancedDocumentProcessor
@@ -161,25 +166,30 @@ class DocumentProcessor:
         """
         chunks = []
         sentences = re.split(r'(?<=[.!?])\s+', text)
-        current_chunk = ""
+        
+        # Collect sentences and join once per chunk instead of growing a string
+        current_parts = []
+        current_size = 0  # Length of the joined chunk including a trailing space
         
         for sentence in sentences:
-            if len(current_chunk + sentence) < chunk_size:
-                current_chunk += sentence + " "
+            if current_size + len(sentence) < chunk_size:
+                current_parts.append(sentence)
+                current_size += len(sentence) + 1
             else:
-                if current_chunk:
+                if current_parts:
                     chunks.append({
-                        'text': current_chunk.strip(),
+                        'text': " ".join(current_parts).strip(),
                         'type': 'content',
-                        'size': len(current_chunk)
+                        'size': current_size
                     })
-                current_chunk = sentence + " "
+                current_parts = [sentence]
+                current_size = len(sentence) + 1
         
-        if current_chunk:
+        if current_parts:
             chunks.append({
-                'text': current_chunk.strip(),
+                'text': " ".join(current_parts).strip(),
                 'type': 'content', 
-                'size': len(current_chunk)
+                'size': current_size
             })
         
         return chunks
@@ -311,6 +321,8 @@ class DocumentProcessor:
         """
         Save processed documents to JSON file.
         
+        Writes compact JSON straight to the file; uses orjson when installed.
+        
         Args:
             documents: List of processed documents
             output_file: Output file path (defaults to processed_documents.json)
@@ -318,8 +330,12 @@ class DocumentProcessor:
         settings = get_settings()
         output_file = output_file or str(Path(settings.processed_data_dir) / "processed_documents.json")
         
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(documents, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(output_file, "wb") as f:
+                f.write(orjson.dumps(documents, option=orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(documents, f, ensure_ascii=False, separators=(",", ":"))
         
         logger.info(f"Saved {len(documents)} processed documents to {output_file}")
 
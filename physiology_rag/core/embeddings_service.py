@@ -4,15 +4,21 @@ Handles Google Gemini API embeddings and ChromaDB vector database operations.
 """
 
 import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import chromadb
 import google.generativeai as genai
+import numpy as np
 
 from physiology_rag.config.settings import get_settings
 from physiology_rag.utils.logging import get_logger
 from physiology_rag.core.cache_manager import get_cache_manager
+from physiology_rag.core.local_embeddings import OnnxEmbedder
+from physiology_rag.core.quantization import SUPPORTED_DTYPES, QuantizedEmbeddingStore
 
 logger = get_logger("embeddings_service")
 
@@ -25,22 +31,51 @@ class EmbeddingsService:
     vector storage with persistent storage and cosine similarity.
     """
     
-    def __init__(self, api_key: str = None):
+    # Candidates pulled per requested result before FP32 reranking of binary hits
+    BINARY_OVERSAMPLE = 4
+    
+    # Concurrent embedding batches, queued batches awaiting insert, and rows per insert
+    EMBED_WORKERS = 8
+    INSERT_QUEUE_SIZE = 4
+    INSERT_BATCH_SIZE = 1024
+    
+    def __init__(self, api_key: str = None, dtype: str = None):
         """
         Initialize embeddings service.
         
         Args:
             api_key: Gemini API key (defaults to settings)
+            dtype: Embedding storage format used for similarity search
+                (defaults to settings)
         """
         settings = get_settings()
         
+        dtype = dtype or settings.embedding_dtype
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+        
         # Configure Gemini API
         api_key = api_key or settings.gemini_api_key
         genai.configure(api_key=api_key)
         
-        # Store settings
+        # Embed locally when an exported ONNX model is configured
+        self.local_embedder = None
         self.embedding_model = settings.gemini_embedding_model
+        if settings.local_embedding_model_dir:
+            self.local_embedder = OnnxEmbedder(settings.local_embedding_model_dir)
+            self.embedding_model = settings.local_embedding_model_dir
+        
+        # Output size of the embedding model, for zero-vector fallbacks. Known
+        # up front for most ONNX models, otherwise taken from the first embedding
+        self.embedding_dim = self.local_embedder.dimension if self.local_embedder else None
+        
+        # Store settings
         self.batch_size = settings.batch_size
+        self.dtype = dtype
+        # Bumped whenever the collection changes so callers can invalidate caches
+        self.generation = 0
+        self._quantized_stores: Dict[str, QuantizedEmbeddingStore] = {}
+        self._warned_missing_store = False
         
         # Initialize cache manager
         self.cache_manager = get_cache_manager()
@@ -58,6 +93,7 @@ class EmbeddingsService:
         logger.info(f"Initialized EmbeddingsService with model: {self.embedding_model}")
         logger.info(f"Vector DB path: {self.vector_db_path}")
         logger.info(f"Collection: {settings.collection_name}")
+        logger.info(f"Embedding storage dtype: {self.dtype}")
     
     def generate_embeddings(
         self, 
@@ -81,37 +117,7 @@ class EmbeddingsService:
         logger.info(f"Generating embeddings for {len(texts)} texts in {total_batches} batches")
         
         for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            batch_embeddings = []
-            
-            for j, text in enumerate(batch):
-                try:
-                    # Check cache first
-                    text_content = text[:1000]  # Limit text length for API
-                    cached_embedding = self.cache_manager.get_embedding(text_content)
-                    
-                    if cached_embedding is not None:
-                        batch_embeddings.append(cached_embedding)
-                        logger.debug(f"Using cached embedding for text {i+j}")
-                    else:
-                        # Generate new embedding
-                        result = genai.embed_content(
-                            model=self.embedding_model,
-                            content=text_content,
-                            task_type="retrieval_document"
-                        )
-                        embedding = result['embedding']
-                        batch_embeddings.append(embedding)
-                        
-                        # Cache the embedding
-                        self.cache_manager.set_embedding(text_content, embedding)
-                        
-                except Exception as e:
-                    logger.error(f"Error generating embedding for text {i+j}: {e}")
-                    # Use zero vector as fallback
-                    batch_embeddings.append([0.0] * 768)
-            
-            all_embeddings.extend(batch_embeddings)
+            all_embeddings.extend(self._embed_batch(texts[i:i + batch_size], i))
             current_batch = i//batch_size + 1
             logger.info(
                 f"✓ Batch {current_batch}/{total_batches} complete "
@@ -121,6 +127,84 @@ class EmbeddingsService:
         logger.info(f"Successfully generated {len(all_embeddings)} embeddings")
         return all_embeddings
     
+    def _embed_batch(self, batch: List[str], offset: int = 0) -> List[List[float]]:
+        """
+        Embed one batch of document texts, using cached embeddings where possible.
+        
+        Args:
+            batch: Texts to embed
+            offset: Index of the first text in the full input (for logging)
+            
+        Returns:
+            Embedding vectors in input order
+        """
+        batch_embeddings = []
+        failed = []
+        
+        for j, text in enumerate(batch):
+            try:
+                # Check cache first
+                text_content = text[:1000]  # Limit text length for API
+                embedding = self.cache_manager.get_embedding(self._cache_key(text_content))
+                
+                if embedding is not None:
+                    logger.debug("Using cached embedding for text %d", offset + j)
+                else:
+                    # Generate new embedding
+                    embedding = self._embed(text_content, "retrieval_document")
+                    
+                    # Cache the embedding
+                    self.cache_manager.set_embedding(self._cache_key(text_content), embedding)
+                
+                self.embedding_dim = len(embedding)
+                    
+            except Exception as e:
+                logger.error(f"Error generating embedding for text {offset+j}: {e}")
+                embedding = None
+                failed.append((j, e))
+            
+            batch_embeddings.append(embedding)
+        
+        if failed:
+            if self.embedding_dim is None:
+                # Nothing has been embedded yet, so the model's size is unknown
+                # and a guessed zero vector could break the collection insert
+                raise failed[-1][1]
+            # Use zero vectors of the model's size as fallback
+            for j, _ in failed:
+                batch_embeddings[j] = [0.0] * self.embedding_dim
+        
+        return batch_embeddings
+    
+    def _embed(self, content, task_type: str):
+        """
+        Embed one text or a list of texts with the configured model.
+        
+        Args:
+            content: Text or list of texts
+            task_type: Gemini task type (ignored by local models)
+            
+        Returns:
+            One embedding for a single text, or a list of embeddings
+        """
+        if self.local_embedder is not None:
+            if isinstance(content, str):
+                return self.local_embedder.embed([content])[0]
+            return self.local_embedder.embed(content)
+        
+        result = genai.embed_content(
+            model=self.embedding_model,
+            content=content,
+            task_type=task_type
+        )
+        return result['embedding']
+    
+    def _cache_key(self, text: str) -> str:
+        """Namespace cache keys for local models so Gemini embeddings are not reused."""
+        if self.local_embedder is not None:
+            return f"{self.embedding_model}:{text}"
+        return text
+    
     def create_chunk_id(self, doc_name: str, chunk_index: int) -> str:
         """
         Create unique ID for a document chunk.
@@ -134,13 +218,68 @@ class EmbeddingsService:
         """
         return f"{doc_name}_chunk_{chunk_index}"
     
-    def add_documents_to_vector_db(self, documents: List[Dict[str, Any]]) -> None:
+    def _quantized_store_path(self, dtype: str) -> Path:
+        """Get the sidecar file holding quantized embeddings."""
+        return self.vector_db_path / f"embeddings_{dtype}.npz"
+    
+    def _get_quantized_store(self, dtype: str) -> QuantizedEmbeddingStore:
+        """
+        Get the quantized embedding store, loading it from disk on first use.
+        
+        Args:
+            dtype: Quantized storage format
+            
+        Returns:
+            Quantized embedding store (empty if nothing persisted yet)
+        """
+        if dtype not in self._quantized_stores:
+            path = self._quantized_store_path(dtype)
+            if path.exists():
+                self._quantized_stores[dtype] = QuantizedEmbeddingStore.load(path)
+            else:
+                self._quantized_stores[dtype] = QuantizedEmbeddingStore(dtype)
+        return self._quantized_stores[dtype]
+    
+    def _use_quantized_search(self) -> bool:
+        """
+        Check whether searches should scan the quantized store.
+        
+        Falls back to the FP32 ChromaDB index, with a warning, when the
+        quantized copy hasn't been written yet.
+        
+        Returns:
+            True if the quantized store for the service dtype has embeddings
+        """
+        if self.dtype == "fp32":
+            return False
+        if len(self._get_quantized_store(self.dtype)):
+            return True
+        
+        if not self._warned_missing_store:
+            logger.warning(
+                f"No {self.dtype} embeddings at {self._quantized_store_path(self.dtype)}; "
+                f"searching the FP32 index instead. Re-index documents with "
+                f"EMBEDDING_DTYPE={self.dtype} to create them"
+            )
+            self._warned_missing_store = True
+        return False
+    
+    def add_documents_to_vector_db(
+        self, 
+        documents: List[Dict[str, Any]], 
+        dtype: Optional[str] = None
+    ) -> None:
         """
         Add processed documents to the vector database.
         
         Args:
             documents: List of processed document data
+            dtype: Embedding storage format (defaults to the service dtype)
         """
+        dtype = dtype or self.dtype
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
         all_texts = []
         all_metadatas = []
         all_ids = []
@@ -175,17 +314,191 @@ class EmbeddingsService:
                 all_metadatas.append(metadata)
         
         logger.info(f"Generating embeddings for {len(all_texts)} chunks")
-        embeddings = self.generate_embeddings(all_texts)
-        
-        logger.info("Adding embeddings to vector database")
-        self.collection.add(
-            embeddings=embeddings,
-            documents=all_texts,
-            metadatas=all_metadatas,
-            ids=all_ids
-        )
+        embeddings = self._embed_and_insert(all_texts, all_metadatas, all_ids)
         
+        self.generation += 1
         logger.info(f"Successfully added {len(all_texts)} chunks to vector database")
+        
+        # Persist quantized copies for compact similarity search
+        if dtype != "fp32" and all_ids:
+            store = self._get_quantized_store(dtype)
+            store.add(all_ids, embeddings)
+            store.save(self._quantized_store_path(dtype))
+    
+    def _embed_and_insert(
+        self, 
+        texts: List[str], 
+        metadatas: List[Dict[str, Any]], 
+        ids: List[str]
+    ) -> List[List[float]]:
+        """
+        Embed chunks and add them to the collection as a pipeline.
+        
+        Batches are embedded concurrently on a thread pool (the work is API
+        bound) while a single writer thread inserts finished batches into
+        ChromaDB, so embedding latency overlaps with database writes.
+        
+        Args:
+            texts: Chunk texts
+            metadatas: Chunk metadata, aligned with texts
+            ids: Chunk IDs, aligned with texts
+            
+        Returns:
+            Embedding vectors in input order
+        """
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        finished: queue.Queue = queue.Queue(maxsize=self.INSERT_QUEUE_SIZE)
+        insert_errors: List[Exception] = []
+        
+        def insert(ranges: List[tuple]) -> None:
+            rows = [i for start, end in ranges for i in range(start, end)]
+            try:
+                self.collection.add(
+                    embeddings=[embeddings[i] for i in rows],
+                    documents=[texts[i] for i in rows],
+                    metadatas=[metadatas[i] for i in rows],
+                    ids=[ids[i] for i in rows]
+                )
+            except Exception as e:
+                # Keep draining the queue so producers never block
+                insert_errors.append(e)
+        
+        def writer() -> None:
+            pending, pending_rows = [], 0
+            while True:
+                item = finished.get()
+                if item is None:
+                    break
+                pending.append(item)
+                pending_rows += item[1] - item[0]
+                if pending_rows >= self.INSERT_BATCH_SIZE:
+                    insert(pending)
+                    pending, pending_rows = [], 0
+            if pending:
+                insert(pending)
+        
+        writer_thread = threading.Thread(target=writer, name="chroma-writer", daemon=True)
+        writer_thread.start()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.EMBED_WORKERS) as executor:
+                futures = {
+                    executor.submit(self._embed_batch, texts[start:start + self.batch_size], start): start
+                    for start in range(0, len(texts), self.batch_size)
+                }
+                for completed, future in enumerate(as_completed(futures), 1):
+                    start = futures[future]
+                    batch_embeddings = future.result()
+                    embeddings[start:start + len(batch_embeddings)] = batch_embeddings
+                    finished.put((start, start + len(batch_embeddings)))
+                    logger.info(f"✓ Batch {completed}/{len(futures)} embedded")
+        finally:
+            finished.put(None)
+            writer_thread.join()
+        
+        if insert_errors:
+            raise insert_errors[0]
+        
+        return embeddings
+    
+    def _search_quantized(self, query_embedding: List[float], n_results: int) -> List[Dict[str, Any]]:
+        """
+        Search the quantized embedding store and join results with stored documents.
+        
+        Args:
+            query_embedding: FP32 query vector
+            n_results: Number of results to return
+            
+        Returns:
+            Formatted search results
+        """
+        store = self._get_quantized_store(self.dtype)
+        
+        # Binary codes are coarse, so oversample and rerank with FP32 vectors
+        rerank = self.dtype == "binary"
+        candidates = n_results * self.BINARY_OVERSAMPLE if rerank else n_results
+        
+        hits = store.search(query_embedding, candidates)
+        if not hits:
+            return []
+        
+        include = ['documents', 'metadatas']
+        if rerank:
+            include.append('embeddings')
+        records = self.collection.get(
+            ids=[chunk_id for chunk_id, _ in hits],
+            include=include
+        )
+        by_id = {
+            chunk_id: i for i, chunk_id in enumerate(records['ids'])
+        }
+        
+        if rerank:
+            vectors = np.asarray(records['embeddings'], dtype=np.float32)
+            query = np.asarray(query_embedding, dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1) * (np.linalg.norm(query) or 1.0)
+            norms[norms == 0] = 1.0
+            exact = vectors @ query / norms
+            hits = sorted(
+                ((chunk_id, float(exact[by_id[chunk_id]])) for chunk_id, _ in hits if chunk_id in by_id),
+                key=lambda hit: hit[1],
+                reverse=True
+            )[:n_results]
+        
+        formatted_results = []
+        for chunk_id, score in hits:
+            if chunk_id not in by_id:
+                continue
+            i = by_id[chunk_id]
+            formatted_results.append({
+                'document': records['documents'][i],
+                'metadata': records['metadatas'][i],
+                'similarity_score': score
+            })
+        return formatted_results
+    
+    @staticmethod
+    def _format_query_results(results: Dict[str, Any], row: int) -> List[Dict[str, Any]]:
+        """
+        Format one query's rows from a ChromaDB query response.
+        
+        Args:
+            results: Raw ChromaDB query response
+            row: Index of the query within the response
+            
+        Returns:
+            Formatted search results
+        """
+        formatted_results = []
+        for i in range(len(results['documents'][row])):
+            formatted_results.append({
+                'document': results['documents'][row][i],
+                'metadata': results['metadatas'][row][i],
+                'similarity_score': 1 - results['distances'][row][i]  # Convert distance to similarity
+            })
+        return formatted_results
+    
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Get the embedding for a search query, using the cache where possible.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Query embedding vector
+        """
+        cache_key = self._cache_key(f"query:{query}")
+        cached_embedding = self.cache_manager.get_embedding(cache_key)
+        
+        if cached_embedding is not None:
+            logger.debug("Using cached query embedding")
+            return cached_embedding
+        
+        # Generate and cache the embedding for the query
+        query_embedding = self._embed(query, "retrieval_query")
+        self.cache_manager.set_embedding(cache_key, query_embedding)
+        return query_embedding
     
     def search_documents(self, query: str, n_results: int = None) -> Dict[str, Any]:
         """
@@ -204,39 +517,20 @@ class EmbeddingsService:
         logger.info(f"Searching for: '{query}' (top {n_results} results)")
         
         try:
-            # Check cache for query embedding
-            cached_embedding = self.cache_manager.get_embedding(f"query:{query}")
+            query_embedding = self.embed_query(query)
             
-            if cached_embedding is not None:
-                query_embedding = cached_embedding
-                logger.debug("Using cached query embedding")
+            if self._use_quantized_search():
+                # Scan quantized embeddings instead of the FP32 index
+                formatted_results = self._search_quantized(query_embedding, n_results)
             else:
-                # Generate embedding for query
-                result = genai.embed_content(
-                    model=self.embedding_model,
-                    content=query,
-                    task_type="retrieval_query"
+                # Search in vector database
+                results = self.collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=n_results,
+                    include=['documents', 'metadatas', 'distances']
                 )
-                query_embedding = result['embedding']
                 
-                # Cache the query embedding
-                self.cache_manager.set_embedding(f"query:{query}", query_embedding)
-            
-            # Search in vector database
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                include=['documents', 'metadatas', 'distances']
-            )
-            
-            # Format results
-            formatted_results = []
-            for i in range(len(results['documents'][0])):
-                formatted_results.append({
-                    'document': results['documents'][0][i],
-                    'metadata': results['metadatas'][0][i],
-                    'similarity_score': 1 - results['distances'][0][i]  # Convert distance to similarity
-                })
+                formatted_results = self._format_query_results(results, 0)
             
             logger.info(f"Found {len(formatted_results)} relevant chunks")
             
@@ -253,6 +547,73 @@ class EmbeddingsService:
                 'error': str(e)
             }
     
+    def search_documents_batch(
+        self, 
+        queries: List[str], 
+        n_results: int = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for relevant document chunks for several queries at once.
+        
+        Uncached query embeddings are generated with a single API call and
+        the vector database is queried once for the whole batch.
+        
+        Args:
+            queries: Search queries
+            n_results: Number of results per query (defaults to settings)
+            
+        Returns:
+            Search results for each query, in input order
+        """
+        settings = get_settings()
+        n_results = n_results or settings.max_retrieval_results
+        
+        if not queries:
+            return []
+        
+        logger.info(f"Batch searching {len(queries)} queries (top {n_results} results)")
+        
+        try:
+            # Collect cached query embeddings and embed the rest together
+            query_embeddings = [
+                self.cache_manager.get_embedding(self._cache_key(f"query:{query}")) for query in queries
+            ]
+            missing = [i for i, embedding in enumerate(query_embeddings) if embedding is None]
+            
+            if missing:
+                embeddings = self._embed([queries[i] for i in missing], "retrieval_query")
+                for i, embedding in zip(missing, embeddings):
+                    query_embeddings[i] = embedding
+                    self.cache_manager.set_embedding(self._cache_key(f"query:{queries[i]}"), embedding)
+            
+            if self._use_quantized_search():
+                all_results = [
+                    self._search_quantized(embedding, n_results) for embedding in query_embeddings
+                ]
+            else:
+                results = self.collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=n_results,
+                    include=['documents', 'metadatas', 'distances']
+                )
+                all_results = [
+                    self._format_query_results(results, row) for row in range(len(queries))
+                ]
+            
+            logger.info(f"Completed batch search for {len(queries)} queries")
+            
+            return [
+                {'query': query, 'results': formatted_results}
+                for query, formatted_results in zip(queries, all_results)
+            ]
+            
+        except Exception as e:
+            logger.error(f"Error during batch search: {e}")
+            return [
+                {'query': query, 'results': [], 'error': str(e)}
+                for query in queries
+            ]
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the vector database collection.
@@ -283,6 +644,13 @@ class EmbeddingsService:
                 name=settings.collection_name,
                 metadata={"hnsw:space": settings.similarity_metric}
             )
+            
+            # Drop quantized copies of the old embeddings
+            for dtype in SUPPORTED_DTYPES:
+                self._quantized_store_path(dtype).unlink(missing_ok=True)
+            self._quantized_stores.clear()
+            self.generation += 1
+            
             logger.info("Successfully reset collection")
         except Exception as e:
             logger.error(f"Error resetting collection: {e}")
@@ -0,0 +1,104 @@
+"""
+Local embedding inference for the Physiology RAG system.
+Runs an exported (optionally int8-quantized) ONNX encoder on CPU with ONNX Runtime.
+
+Export and quantize a model once with Optimum:
+
+    optimum-cli export onnx --model <embed_model> --task feature-extraction ./onnx_model
+    optimum-cli onnxruntime quantize --avx512_vnni --onnx_model ./onnx_model -o ./onnx_int8
+"""
+
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from physiology_rag.utils.logging import get_logger
+
+logger = get_logger("local_embeddings")
+
+
+class OnnxEmbedder:
+    """
+    Sentence embedder backed by an ONNX Runtime CPU session.
+
+    Produces mean-pooled, L2-normalized embeddings from the encoder's last
+    hidden state, matching sentence-transformers style models.
+    """
+
+    QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+    MODEL_FILE = "model.onnx"
+
+    def __init__(self, model_dir: str, max_length: int = 512):
+        """
+        Load the ONNX model and tokenizer.
+
+        Args:
+            model_dir: Directory containing the exported model and tokenizer.json
+            max_length: Maximum tokens per text
+        """
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError(
+                "Local embeddings require onnxruntime and tokenizers: "
+                "pip install onnxruntime tokenizers"
+            ) from e
+
+        model_dir = Path(model_dir)
+        model_path = model_dir / self.QUANTIZED_MODEL_FILE
+        if not model_path.exists():
+            model_path = model_dir / self.MODEL_FILE
+
+        # Full graph optimization enables operator fusion for the CPU provider
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        # Embedding size from the output's hidden dimension (None if not static)
+        hidden_size = self.session.get_outputs()[0].shape[-1]
+        self.dimension = hidden_size if isinstance(hidden_size, int) else None
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        logger.info(f"Loaded local embedding model: {model_path}")
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors
+        """
+        if not texts:
+            return []
+
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+
+        feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        if 'token_type_ids' in self.input_names:
+            feeds['token_type_ids'] = np.array(
+                [encoding.type_ids for encoding in encodings], dtype=np.int64
+            )
+
+        hidden_states = self.session.run(None, feeds)[0]
+
+        # Mean-pool over real tokens, then normalize for cosine similarity
+        mask = attention_mask[..., np.newaxis].astype(np.float32)
+        pooled = (hidden_states * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+        return pooled.tolist()
@@ -0,0 +1,238 @@
+"""
+Embedding quantization for the Physiology RAG system.
+Stores embeddings in compact formats and scans them with NumPy for similarity search.
+"""
+
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from physiology_rag.utils.logging import get_logger
+
+logger = get_logger("quantization")
+
+SUPPORTED_DTYPES = ("fp32", "bf16", "int8", "binary")
+
+# NumPy element type each quantized format is stored as
+_STORAGE_DTYPES = {"bf16": np.uint16, "int8": np.int8, "binary": np.uint8}
+
+
+def calibrate_int8_scale(embeddings: np.ndarray, quantile: float = 0.999) -> np.ndarray:
+    """
+    Compute per-dimension int8 scales from a calibration sample.
+
+    Args:
+        embeddings: FP32 embeddings of shape (N, D)
+        quantile: Quantile of absolute values mapped to 127
+
+    Returns:
+        Scale vector of shape (D,)
+    """
+    ranges = np.quantile(np.abs(embeddings), quantile, axis=0)
+    ranges[ranges == 0] = 1.0  # Avoid division by zero on dead dimensions
+    return (127.0 / ranges).astype(np.float32)
+
+
+def quantize_int8(embeddings: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """Quantize FP32 embeddings to int8 with per-dimension scales."""
+    return np.clip(np.round(embeddings * scale), -127, 127).astype(np.int8)
+
+
+def dequantize_int8(quantized: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """Restore approximate FP32 embeddings from int8 values."""
+    return quantized.astype(np.float32) / scale
+
+
+def to_bf16(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Convert FP32 embeddings to bfloat16 stored as uint16.
+
+    Keeps the upper 16 bits of each float (sign, exponent, 7 mantissa bits)
+    with round-to-nearest-even on the dropped half.
+    """
+    bits = np.ascontiguousarray(embeddings, dtype=np.float32).view(np.uint32)
+    rounding = ((bits >> 16) & 1) + np.uint32(0x7FFF)
+    return ((bits + rounding) >> 16).astype(np.uint16)
+
+
+def from_bf16(values: np.ndarray) -> np.ndarray:
+    """Upcast bfloat16 values stored as uint16 back to FP32."""
+    return (values.astype(np.uint32) << 16).view(np.float32)
+
+
+def binarize(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Binary-quantize embeddings to one sign bit per dimension.
+
+    Args:
+        embeddings: FP32 embeddings of shape (N, D)
+
+    Returns:
+        Packed bits of shape (N, ceil(D / 8))
+    """
+    return np.packbits(embeddings > 0, axis=1)
+
+
+def hamming_distances(packed: np.ndarray, query_bits: np.ndarray) -> np.ndarray:
+    """Count differing bits between each packed row and a packed query."""
+    return np.bitwise_count(np.bitwise_xor(packed, query_bits)).sum(axis=1, dtype=np.int64)
+
+
+class QuantizedEmbeddingStore:
+    """
+    Compact on-disk embedding store with brute-force cosine search.
+
+    Keeps chunk IDs alongside quantized vectors so results can be joined
+    back to documents and metadata held in the vector database.
+    """
+
+    def __init__(self, dtype: str = "int8"):
+        """
+        Initialize an empty store.
+
+        Args:
+            dtype: Storage format for embeddings
+        """
+        if dtype not in SUPPORTED_DTYPES or dtype == "fp32":
+            raise ValueError(f"Unsupported quantized dtype: {dtype}")
+
+        self.dtype = dtype
+        self.dim = 0
+        self.ids: List[str] = []
+        self.data: np.ndarray = None
+        self.scale: np.ndarray = None
+        self.norms: np.ndarray = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _encode(self, embeddings: np.ndarray) -> np.ndarray:
+        """Convert FP32 embeddings to the storage format."""
+        if self.dtype == "binary":
+            return binarize(embeddings)
+        if self.dtype == "bf16":
+            return to_bf16(embeddings)
+        if self.scale is None:
+            self.scale = calibrate_int8_scale(embeddings)
+        return quantize_int8(embeddings, self.scale)
+
+    def add(self, ids: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """
+        Quantize and add embeddings to the store.
+
+        IDs already in the store have their rows replaced, so re-indexing
+        the same chunks doesn't duplicate them. Within one call the last
+        embedding for a repeated ID wins.
+
+        Args:
+            ids: Chunk identifiers
+            embeddings: FP32 embedding vectors
+        """
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.size == 0:
+            return
+
+        self.dim = vectors.shape[1]
+        encoded = self._encode(vectors)
+        norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+
+        incoming = {chunk_id: i for i, chunk_id in enumerate(ids)}
+        stored_rows = {chunk_id: row for row, chunk_id in enumerate(self.ids)}
+
+        replaced = [(stored_rows[chunk_id], i) for chunk_id, i in incoming.items() if chunk_id in stored_rows]
+        if replaced:
+            rows, sources = map(list, zip(*replaced))
+            self.data[rows] = encoded[sources]
+            self.norms[rows] = norms[sources]
+
+        added = [(chunk_id, i) for chunk_id, i in incoming.items() if chunk_id not in stored_rows]
+        if not added:
+            return
+        new_ids, sources = map(list, zip(*added))
+        if self.data is None:
+            self.data, self.norms = encoded[sources], norms[sources]
+        else:
+            self.data = np.concatenate([self.data, encoded[sources]])
+            self.norms = np.concatenate([self.norms, norms[sources]])
+        self.ids.extend(new_ids)
+
+    def search(self, query_embedding: Sequence[float], n_results: int) -> List[Tuple[str, float]]:
+        """
+        Find the most similar stored embeddings.
+
+        BF16 and int8 stores rank by cosine similarity; binary stores rank by
+        normalized Hamming similarity (1 - differing bits / dimensions).
+
+        Args:
+            query_embedding: FP32 query vector
+            n_results: Number of results to return
+
+        Returns:
+            List of (chunk_id, similarity) pairs, best first
+        """
+        if not self.ids:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+
+        if self.dtype == "binary":
+            query_bits = binarize(query[np.newaxis, :])[0]
+            scores = 1.0 - hamming_distances(self.data, query_bits) / self.dim
+            return self._top_k(scores, n_results)
+
+        if self.dtype == "bf16":
+            dots = from_bf16(self.data) @ query
+        else:
+            # Fold the per-dimension scale into the query so the int8 matrix
+            # is scanned directly without dequantizing it
+            dots = self.data @ (query / self.scale)
+
+        denom = self.norms * (np.linalg.norm(query) or 1.0)
+        denom[denom == 0] = 1.0
+        scores = dots / denom
+        return self._top_k(scores, n_results)
+
+    def _top_k(self, scores: np.ndarray, n_results: int) -> List[Tuple[str, float]]:
+        """Select the highest-scoring IDs in descending order."""
+        n_results = min(n_results, len(self.ids))
+        top = np.argpartition(-scores, n_results - 1)[:n_results]
+        top = top[np.argsort(-scores[top])]
+
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+    def save(self, path: Path) -> None:
+        """Persist the store as a NumPy archive."""
+        data, norms = self.data, self.norms
+        if data is None:
+            # Save empty typed arrays: None would become an object array,
+            # which load() can't read without pickle
+            width = -(-self.dim // 8) if self.dtype == "binary" else self.dim
+            data = np.empty((0, width), dtype=_STORAGE_DTYPES[self.dtype])
+            norms = np.empty(0, dtype=np.float32)
+
+        arrays = {
+            'dtype': self.dtype,
+            'dim': self.dim,
+            'ids': np.asarray(self.ids, dtype=str),
+            'data': data,
+            'norms': norms
+        }
+        if self.scale is not None:
+            arrays['scale'] = self.scale
+        np.savez(path, **arrays)
+        logger.info(f"Saved {len(self.ids)} {self.dtype} embeddings to {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "QuantizedEmbeddingStore":
+        """Load a store previously written with save()."""
+        with np.load(path, allow_pickle=False) as archive:
+            store = cls(str(archive['dtype']))
+            store.dim = int(archive['dim'])
+            store.ids = archive['ids'].tolist()
+            if store.ids:
+                store.data = archive['data']
+                store.norms = archive['norms']
+            if 'scale' in archive:
+                store.scale = archive['scale']
+        return store
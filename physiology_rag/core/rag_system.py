@@ -3,7 +3,7 @@ RAG (Retrieval-Augmented Generation) system for the Physiology project.
 Combines retrieval from ChromaDB with Gemini API for answer generation.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import google.generativeai as genai
 
@@ -63,6 +63,40 @@ class RAGSystem:
         
         return self.embeddings_service.search_documents(query, n_results)
     
+    def retrieve_relevant_chunks_batch(self, queries: List[str], n_results: int = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve relevant document chunks for several queries at once.
+        
+        The queries are embedded with one API call and searched with one
+        vector database query.
+        
+        Args:
+            queries: User questions
+            n_results: Number of results per query (defaults to settings)
+            
+        Returns:
+            Retrieval results for each query, in input order
+        """
+        n_results = n_results or self.max_retrieval_results
+        logger.info(f"Retrieving relevant chunks for {len(queries)} queries")
+        
+        return self.embeddings_service.search_documents_batch(queries, n_results)
+    
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a query with the retrieval model.
+        
+        The embedding is cached, so a following retrieval for the same query
+        does not embed it again.
+        
+        Args:
+            query: User question
+            
+        Returns:
+            Query embedding vector
+        """
+        return self.embeddings_service.embed_query(query)
+    
     def format_context(self, retrieval_results: Dict[str, Any]) -> str:
         """
         Format retrieved chunks into context for Gemini.
@@ -101,6 +135,18 @@ Source {i+1}: {doc_name} - {section_title} (Page {page_id}) [Relevance: {score:.
         logger.info(f"Formatted context with {len(retrieval_results['results'])} sources")
         return context
     
+    @staticmethod
+    def _build_prompt(query: str, context: str) -> str:
+        """Build the Gemini prompt for a question and its retrieved context."""
+        return f"""Based on this physiology information:
+
+{context}
+
+Question: {query}
+
+Provide a clear, educational answer for medical students. Include source references when possible.
+Focus on being accurate, comprehensive, and easy to understand."""
+    
     def generate_answer(self, query: str, context: str) -> str:
         """
         Generate answer using Gemini with retrieved context.
@@ -112,15 +158,8 @@ Source {i+1}: {doc_name} - {section_title} (Page {page_id}) [Relevance: {score:.
         Returns:
             Generated answer
         """
-        prompt = f"""Based on this physiology information:
-
-{context}
-
-Question: {query}
-
-Provide a clear, educational answer for medical students. Include source references when possible.
-Focus on being accurate, comprehensive, and easy to understand."""
-
+        prompt = self._build_prompt(query, context)
+        
         try:
             logger.info("Generating response with Gemini")
             response = self.model.generate_content(prompt)
@@ -136,6 +175,30 @@ Focus on being accurate, comprehensive, and easy to understand."""
             logger.error(f"Error generating response: {e}")
             return f"Error generating response: {str(e)}"
     
+    def generate_answer_stream(self, query: str, context: str) -> Iterator[str]:
+        """
+        Generate an answer with Gemini, yielding text as it is produced.
+        
+        Unlike generate_answer, errors are raised rather than returned as
+        text, since part of the answer may already have been yielded.
+        
+        Args:
+            query: User question
+            context: Formatted context from retrieval
+            
+        Yields:
+            Chunks of the generated answer
+        """
+        logger.info("Streaming response from Gemini")
+        
+        try:
+            for chunk in self.model.generate_content(self._build_prompt(query, context), stream=True):
+                if chunk.text:
+                    yield chunk.text
+        except Exception as e:
+            logger.error(f"Error streaming response: {e}")
+            raise
+    
     def answer_question(self, query: str, n_results: int = None) -> Dict[str, Any]:
         """
         Complete RAG pipeline: retrieve + generate answer.
@@ -5,7 +5,7 @@ Provides dependency injection for coordinated learning experiences.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 
 from physiology_rag.core.rag_system import RAGSystem
 
@@ -170,6 +170,14 @@ class MedicalContext:
         """Add a topic to current focus."""
         if topic not in self.current_topics:
             self.current_topics.append(topic)
+    
+    def add_current_topics(self, topics: Iterable[str]) -> None:
+        """Add several topics to current focus, keeping their order and skipping duplicates."""
+        known = set(self.current_topics)
+        for topic in topics:
+            if topic not in known:
+                known.add(topic)
+                self.current_topics.append(topic)
 
 
 def create_medical_context(
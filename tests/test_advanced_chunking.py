@@ -0,0 +1,92 @@
+"""
+Tests for advanced chunking module.
+"""
+
+from physiology_rag.core.advanced_chunking import MedicalConceptDetector, SemanticChunker
+
+
+class TestMedicalConceptDetector:
+    """Test cases for MedicalConceptDetector class."""
+
+    def test_detect_concepts(self):
+        """Test that concepts are grouped by category and deduplicated."""
+        detector = MedicalConceptDetector()
+
+        concepts = detector.detect_concepts(
+            "The heart pumps blood. Blood pressure rises with heart rate. The heart adapts."
+        )
+
+        assert sorted(concepts['anatomy']) == ['heart']
+        assert sorted(concepts['physiology']) == ['Blood pressure', 'heart rate']
+        assert concepts['pathology'] == []
+        assert concepts['pharmacology'] == []
+
+    def test_detect_concepts_whole_words(self):
+        """Test that terms only match as whole words."""
+        detector = MedicalConceptDetector()
+
+        concepts = detector.detect_concepts("A backbone and a heartbeat")
+
+        assert all(not found for found in concepts.values())
+
+    def test_detect_concepts_shared_and_nested_terms(self):
+        """Test terms listed in several categories or inside longer phrases."""
+        detector = MedicalConceptDetector()
+
+        concepts = detector.detect_concepts("Metabolism raises the heart rate")
+
+        assert sorted(concepts['physiology']) == ['Metabolism', 'heart rate']
+        assert concepts['pharmacology'] == ['Metabolism']
+        assert concepts['anatomy'] == ['heart']
+
+    def test_cached_results_are_not_shared(self):
+        """Test that mutating a result doesn't affect later lookups of the same text."""
+        detector = MedicalConceptDetector()
+
+        detector.detect_concepts("The neuron fires")['anatomy'].append('liver')
+
+        assert detector.detect_concepts("The neuron fires")['anatomy'] == ['neuron']
+
+    def test_count_concepts_matches_detect_concepts(self):
+        """Test that the count agrees with the detected concept lists."""
+        detector = MedicalConceptDetector()
+        text = "Metabolism raises the heart rate. The heart and lung adapt to drug dose."
+
+        assert detector.count_concepts(text) == sum(
+            len(found) for found in detector.detect_concepts(text).values()
+        )
+        assert detector.count_concepts("") == 0
+
+    def test_is_medical_boundary(self):
+        """Test boundaries between sentences about different concepts."""
+        detector = MedicalConceptDetector()
+
+        assert detector.is_medical_boundary("The heart pumps.", "The kidney filters.")
+        assert not detector.is_medical_boundary("The Heart pumps.", "The heart rests.")
+        assert not detector.is_medical_boundary("Nothing here.", "Nor here.")
+
+
+class TestSemanticChunker:
+    """Test cases for SemanticChunker class."""
+
+    def test_boundaries_align_with_sentences(self):
+        """Test that concept boundaries fall on sentence starts despite wide gaps."""
+        chunker = SemanticChunker()
+        text = "The heart pumps blood.   The kidney filters plasma.\n\nThe lung exchanges gas."
+
+        boundaries = chunker.find_semantic_boundaries(text)
+
+        assert boundaries == [text.index("The kidney"), text.index("The lung")]
+
+    def test_chunks_cover_text_without_boundaries(self):
+        """Test that text with few boundaries is chunked fully, without gaps."""
+        chunker = SemanticChunker(chunk_size=1000, overlap_ratio=0.1)
+        text = "word " * 600
+
+        chunks = chunker.chunk_text(text)
+
+        assert chunks[0]['start_idx'] == 0
+        assert chunks[-1]['end_idx'] == len(text)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert previous['start_idx'] < chunk['start_idx'] < previous['end_idx']
+            assert chunk['overlap_previous']
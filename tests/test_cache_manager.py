@@ -0,0 +1,41 @@
+"""
+Tests for the caching layer.
+"""
+
+import numpy as np
+
+from physiology_rag.core.cache_manager import SemanticQueryCache
+
+
+class TestSemanticQueryCache:
+    """Test cases for SemanticQueryCache."""
+
+    def test_similar_query_hits(self):
+        """Test that a nearly identical embedding returns the cached result."""
+        cache = SemanticQueryCache(similarity_threshold=0.9)
+        cache.set("what is a synapse", [1.0, 0.0, 0.0], {"answer": "A junction"})
+
+        assert cache.get([0.99, 0.05, 0.0]) == {"answer": "A junction"}
+        assert cache.get([0.0, 1.0, 0.0]) is None
+        assert cache.get_stats()["hits"] == 1
+
+    def test_context_isolation(self):
+        """Test that entries only match lookups with the same context hash."""
+        cache = SemanticQueryCache()
+        cache.set("q", [0.0, 1.0], "user a answer", context_hash="user_a")
+
+        assert cache.get([0.0, 1.0], context_hash="user_b") is None
+        assert cache.get([0.0, 1.0], context_hash="user_a") == "user a answer"
+
+    def test_lru_eviction_and_ttl(self):
+        """Test that the least recently used entry is evicted and old entries expire."""
+        cache = SemanticQueryCache(max_entries=2)
+        for i, vector in enumerate(np.eye(3)):
+            cache.set(f"q{i}", vector, i)
+
+        assert cache.get([1.0, 0.0, 0.0]) is None
+        assert cache.get([0.0, 0.0, 1.0]) == 2
+
+        cache.ttl_seconds = -1
+        assert cache.get([0.0, 0.0, 1.0]) is None
+        assert len(cache.entries) == 0
@@ -0,0 +1,135 @@
+"""
+Tests for embedding quantization module.
+"""
+
+import numpy as np
+import pytest
+
+from physiology_rag.core.quantization import (
+    QuantizedEmbeddingStore,
+    binarize,
+    calibrate_int8_scale,
+    dequantize_int8,
+    from_bf16,
+    quantize_int8,
+    to_bf16,
+)
+
+
+@pytest.fixture
+def embeddings():
+    """Random unit-normalized embeddings."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((200, 64)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestInt8Quantization:
+    """Test cases for int8 scalar quantization."""
+
+    def test_round_trip(self, embeddings):
+        """Test that dequantized values stay close to the originals."""
+        scale = calibrate_int8_scale(embeddings)
+        quantized = quantize_int8(embeddings, scale)
+
+        assert quantized.dtype == np.int8
+        assert np.abs(dequantize_int8(quantized, scale) - embeddings).max() < 0.05
+
+
+class TestBfloat16:
+    """Test cases for bfloat16 conversion."""
+
+    def test_round_trip(self, embeddings):
+        """Test that bf16 keeps about three significant digits."""
+        stored = to_bf16(embeddings)
+
+        assert stored.dtype == np.uint16
+        np.testing.assert_allclose(from_bf16(stored), embeddings, rtol=1e-2, atol=1e-6)
+
+    def test_exact_values_survive(self):
+        """Test that values representable in bf16 are unchanged."""
+        values = np.array([[1.0, -2.0, 0.5, 0.0]], dtype=np.float32)
+        np.testing.assert_array_equal(from_bf16(to_bf16(values)), values)
+
+
+class TestBinaryQuantization:
+    """Test cases for binary quantization."""
+
+    def test_binarize_packs_sign_bits(self):
+        """Test that each dimension becomes one sign bit."""
+        vectors = np.array([[1.0, -1.0, 0.5, -0.5, 2.0, -2.0, 0.1, -0.1, 3.0]])
+        packed = binarize(vectors)
+
+        assert packed.shape == (1, 2)
+        assert packed[0, 0] == 0b10101010
+        assert packed[0, 1] == 0b10000000
+
+
+class TestQuantizedEmbeddingStore:
+    """Test cases for QuantizedEmbeddingStore."""
+
+    def test_search_finds_exact_match(self, embeddings):
+        """Test that a stored vector is its own nearest neighbour."""
+        store = QuantizedEmbeddingStore("int8")
+        store.add([f"chunk_{i}" for i in range(len(embeddings))], embeddings)
+
+        hits = store.search(embeddings[42], n_results=3)
+
+        assert len(hits) == 3
+        assert hits[0][0] == "chunk_42"
+        assert hits[0][1] == pytest.approx(1.0, abs=0.02)
+
+    def test_binary_search_finds_exact_match(self, embeddings):
+        """Test Hamming search over binary codes."""
+        store = QuantizedEmbeddingStore("binary")
+        store.add([f"chunk_{i}" for i in range(len(embeddings))], embeddings)
+
+        hits = store.search(embeddings[13], n_results=5)
+
+        assert hits[0] == ("chunk_13", 1.0)
+
+    def test_save_and_load(self, embeddings, temp_dir):
+        """Test persisting the store to disk."""
+        store = QuantizedEmbeddingStore("int8")
+        store.add([f"chunk_{i}" for i in range(len(embeddings))], embeddings)
+
+        path = temp_dir / "embeddings_int8.npz"
+        store.save(path)
+        loaded = QuantizedEmbeddingStore.load(path)
+
+        assert len(loaded) == len(store)
+        assert loaded.search(embeddings[7], 1)[0][0] == "chunk_7"
+
+    def test_save_and_load_empty_store(self, embeddings, temp_dir):
+        """Test that an empty store round-trips and accepts new embeddings."""
+        path = temp_dir / "embeddings_bf16.npz"
+        QuantizedEmbeddingStore("bf16").save(path)
+        loaded = QuantizedEmbeddingStore.load(path)
+
+        assert len(loaded) == 0
+        assert loaded.search(embeddings[0], 1) == []
+
+        loaded.add(["chunk_0"], embeddings[:1])
+        assert loaded.search(embeddings[0], 1)[0][0] == "chunk_0"
+
+    def test_adding_same_ids_replaces_rows(self, embeddings):
+        """Test that re-adding existing IDs doesn't duplicate them."""
+        store = QuantizedEmbeddingStore("bf16")
+        ids = [f"chunk_{i}" for i in range(len(embeddings))]
+        store.add(ids, embeddings)
+        store.add(ids, embeddings)
+
+        assert len(store) == len(embeddings)
+        hits = store.search(embeddings[5], n_results=3)
+        assert len({chunk_id for chunk_id, _ in hits}) == 3
+
+        # New vectors for an existing ID replace the old ones
+        store.add(["chunk_5", "chunk_new"], embeddings[[9, 10]])
+        assert len(store) == len(embeddings) + 1
+        top_ids = {chunk_id for chunk_id, _ in store.search(embeddings[9], n_results=2)}
+        assert top_ids == {"chunk_5", "chunk_9"}
+
+    def test_rejects_unknown_dtype(self):
+        """Test that unsupported dtypes are rejected."""
+        with pytest.raises(ValueError):
+            QuantizedEmbeddingStore("fp64")